@@ -1,20 +1,34 @@
 from __future__ import annotations
-import json
+import functools
 import math
+import os
 import re
-from dataclasses import dataclass
-from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+import orjson
 import pandas as pd
+import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
 from dateutil.relativedelta import relativedelta
 import calendar
 
 
 BACKEND_ROOT = Path(__file__).resolve().parent
 DATA_ROOT = BACKEND_ROOT / "data"
+PRICES_DIR = DATA_ROOT / "prices"   # cached weekly prices per ticker (parquet)
+YAHOO_BATCH_SIZE = 50               # tickers per yf.download call
+
+# One keep-alive session for every Yahoo request in this process, so the
+# TLS handshake is paid once instead of per ticker / per chunk.
+# (yf.download with threads=True fetches a chunk's tickers in parallel,
+# hence the larger pool.)
+_YAHOO_SESSION = requests.Session()
+_YAHOO_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
 
 # ===============================================
 #  Script overview
@@ -26,7 +40,8 @@ DATA_ROOT = BACKEND_ROOT / "data"
 #      cash flow) into a quarterly DataFrame with numeric values.
 #   2) Parse period labels (e.g. "Oct 2025 (FQ4)") into fiscal year/quarter
 #      and an exact period_end_date.
-#   3) Fetch daily prices from Yahoo Finance, resample them to weekly
+#   3) Fetch daily prices from Yahoo Finance (batched, many tickers per
+#      request, cached under data/prices/), resample them to weekly
 #      average close prices per ticker.
 #   4) Merge weekly prices with the latest known quarterly fundamentals
 #      (using an as-of merge and forward-fill), then engineer features:
@@ -48,7 +63,53 @@ DATA_ROOT = BACKEND_ROOT / "data"
 #     and derived ratios without being distracted by raw messy inputs
 #=================================================================================================
 
+# Columns kept for GPT in data/llm_out (sector is prepended as identifier)
+LLM_FEATURE_COLS = [
+    # identifiers
+    "week_end_date",
+
+    # price
+    "weekly_avg_close",
+
+    # TTM fundamentals
+    "revenue_ttm",
+    "eps_ttm",
+    "fcf_ttm",
+    "net_income_ttm",
+
+    # growth
+    "rev_qoq",
+    "rev_yoy",
+    "eps_qoq",
+    "eps_yoy",
+
+    # valuation
+    "market_cap",
+    "pe_ttm",
+    "ps_ttm",
+    "fcf_yield_ttm",
+
+    # momentum
+    "ret_1w",
+    "ret_4w",
+    "ret_12w",
+
+    # trend indicators
+    "sma_4w",
+    "sma_12w",
+    "sma_24w",
+    "price_vs_sma_4w",
+    "price_vs_sma_12w",
+    "price_vs_sma_24w",
+
+    # optional quality ratios
+    "Gross Margin %",
+    "Operating Income %",
+    "Net Profit %",
+]
+
 UNIT_PATTERN = re.compile(r"^\s*([+-]?\d*\.?\d+)\s*([KMBT]?)\s*$")
+_UNIT_MULTIPLIERS = {"": 1.0, "K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
 
 
 def parse_numeric(value: Any) -> Optional[float]:
@@ -80,7 +141,7 @@ def parse_numeric(value: Any) -> Optional[float]:
         num = parse_numeric(inner)
         return num / 100.0 if num is not None else None
 
-    m = UNIT_PATTERN.match(s)
+    m = UNIT_PATTERN.fullmatch(s)
     if not m:
         # Fallback: try plain float
         try:
@@ -106,6 +167,7 @@ def parse_numeric(value: Any) -> Optional[float]:
 
 
 PERIOD_PATTERN = re.compile(r"^([A-Za-z]{3}) (\d{4}) \(FQ(\d)\)$")
+_MONTH_ABBR = {m: i for i, m in enumerate(calendar.month_abbr) if m}
 
 
 def parse_period_label(label: str) -> Dict[str, Any]:
@@ -115,8 +177,22 @@ def parse_period_label(label: str) -> Dict[str, Any]:
         "fiscal_quarter": 4,
         "period_end_date": date(2025, 10, 31)
     }
+
+    Returns a fresh dict each call; the cached work is in _parse_period_label.
     """
-    m = PERIOD_PATTERN.match(label.strip())
+    year, fiscal_quarter, period_end_date = _parse_period_label(label)
+    return {
+        "fiscal_year": year,
+        "fiscal_quarter": fiscal_quarter,
+        "period_end_date": period_end_date,
+    }
+
+
+# Cached on the label (tickers share the same few dozen period labels);
+# returns an immutable tuple so callers can't alter the cached value
+@functools.lru_cache(maxsize=4096)
+def _parse_period_label(label: str) -> Tuple[int, int, date]:
+    m = PERIOD_PATTERN.fullmatch(label.strip())
     if not m:
         raise ValueError(f"Unexpected period label format: {label!r}")
 
@@ -125,30 +201,42 @@ def parse_period_label(label: str) -> Dict[str, Any]:
     fiscal_quarter = int(fq_str)
 
     # Map month abbreviation to month number
-    try:
-        month = datetime.strptime(month_str, "%b").month
-    except ValueError:
+    month = _MONTH_ABBR.get(month_str.title())
+    if month is None:
         raise ValueError(f"Unknown month in period label: {label!r}")
 
     # Use last day of that month as period end date
     last_day = calendar.monthrange(year, month)[1]
-    period_end_date = date(year, month, last_day)
+    return year, fiscal_quarter, date(year, month, last_day)
 
-    return {
-        "fiscal_year": year,
-        "fiscal_quarter": fiscal_quarter,
-        "period_end_date": period_end_date,
-    }
+def parse_numeric_series(raw: pd.Series) -> pd.Series:
+    """
+    Vectorized version of parse_numeric for a whole column of raw values.
+
+    Runs UNIT_PATTERN once over the Series with .str.extract and applies the
+    unit multiplier / percent scaling as array ops. Anything the regex can't
+    handle falls back to parse_numeric, so results (and errors) match it.
+    """
+    s = raw.astype("string").str.strip()
+    empty = s.isna() | (s == "") | (s == "-")
+
+    # Percent (convert to fraction)
+    pct = s.str.endswith("%").fillna(False)
+    core = s.mask(pct, s.str[:-1])
+
+    parts = core.str.extract(UNIT_PATTERN)
+    base = pd.to_numeric(parts[0], errors="coerce")
+    mult = parts[1].str.upper().map(_UNIT_MULTIPLIERS).fillna(1.0)
+    values = (base * mult).astype("float64")
+    values = values.where(~pct, values / 100.0)
+
+    # Rare leftovers (no regex match) go through the scalar parser
+    leftover = values.isna() & ~empty
+    for idx in leftover[leftover].index:
+        parsed = parse_numeric(raw.at[idx])
+        values.at[idx] = parsed if parsed is not None else float("nan")
 
-@dataclass
-class FundamentalsQuarter:
-    ticker: str
-    period_label: str
-    fiscal_year: int
-    fiscal_quarter: int
-    period_end_date: date
-    # We'll keep metrics in a dict so we can expand to columns later
-    metrics: Dict[str, Optional[float]]
+    return values
 
 
 def parse_fundamentals_json(path: Path) -> pd.DataFrame:
@@ -156,70 +244,53 @@ def parse_fundamentals_json(path: Path) -> pd.DataFrame:
     Parse one JSON file with fundamentals (like A.json) into a tidy DataFrame:
     columns: ticker, period_label, fiscal_year, fiscal_quarter, period_end_date
     """
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = orjson.loads(path.read_bytes())
 
     ticker = data["ticker"]
     periods: List[str] = data["periods"]
 
-    # Collect all metric trees (income_statement, balance_sheet, cash_flow)
-    # Each is dict[metric_name][period_label] = value_str
-    metric_sources: Dict[str, Dict[str, Dict[str, Any]]] = {
-        "income_statement": data.get("income_statement", {}),
-        "balance_sheet": data.get("balance_sheet", {}),
-        "cash_flow": data.get("cash_flow", {}),
+    # Flatten the metric trees (income_statement, balance_sheet, cash_flow),
+    # each dict[metric_name][period_label] = value_str, into:
+    # metric_name -> {period_label: value}. Metric names don't repeat across
+    # groups in the Bing exports; if one ever did, the later group wins.
+    flat_metrics: Dict[str, Dict[str, Any]] = {
+        metric_name: per_period_values
+        for group_name in ("income_statement", "balance_sheet", "cash_flow")
+        for metric_name, per_period_values in data.get(group_name, {}).items()
     }
 
-    # Flatten metrics into: metric_name -> {period_label: value}
-    flat_metrics: Dict[str, Dict[str, Any]] = {}
-
-    for group_name, group in metric_sources.items():
-        for metric_name, per_period_values in group.items():
-            full_name = metric_name  # you can later prefix with group_name if needed
-            if full_name not in flat_metrics:
-                flat_metrics[full_name] = {}
-            for period_label, raw_val in per_period_values.items():
-                flat_metrics[full_name][period_label] = raw_val
-
-    # Build rows per period
-    rows: List[FundamentalsQuarter] = []
-
-    for period_label in periods:
-        period_meta = parse_period_label(period_label)
-
-        # Collect metric values for this period
-        metrics_for_period: Dict[str, Optional[float]] = {}
-        for metric_name, per_period in flat_metrics.items():
-            raw_value = per_period.get(period_label, None)
-            metrics_for_period[metric_name] = parse_numeric(raw_value)
-
-        rows.append(
-            FundamentalsQuarter(
-                ticker=ticker,
-                period_label=period_label,
-                fiscal_year=period_meta["fiscal_year"],
-                fiscal_quarter=period_meta["fiscal_quarter"],
-                period_end_date=period_meta["period_end_date"],
-                metrics=metrics_for_period,
-            )
-        )
+    # Long frame: one row per (metric, period) cell, parsed in a single vectorized pass
+    long_df = pd.DataFrame.from_records(
+        [
+            (metric_name, period_label, raw_val)
+            for metric_name, per_period in flat_metrics.items()
+            for period_label, raw_val in per_period.items()
+        ],
+        columns=["metric", "period_label", "raw"],
+    )
+    long_df["value"] = parse_numeric_series(long_df["raw"])
+
+    # Back to wide: one row per period, one column per metric
+    metrics_wide = (
+        long_df
+        .pivot(index="period_label", columns="metric", values="value")
+        .reindex(index=periods, columns=list(flat_metrics))
+    )
 
-    # Convert to DataFrame
-    records: List[Dict[str, Any]] = []
-    for r in rows:
-        base = {
-            "ticker": r.ticker,
-            "period_label": r.period_label,
-            "fiscal_year": r.fiscal_year,
-            "fiscal_quarter": r.fiscal_quarter,
-            "period_end_date": r.period_end_date,
-        }
-        base.update(r.metrics)
-        records.append(base)
-
-    df = pd.DataFrame(records)
+    # Period metadata (fiscal year/quarter, period end) per column label
+    meta_df = pd.DataFrame([parse_period_label(p) for p in periods])
+    meta_df.insert(0, "period_label", periods)
+    meta_df.insert(0, "ticker", ticker)
+
+    df = pd.concat(
+        [meta_df, metrics_wide.reset_index(drop=True)],
+        axis=1,
+    )
+    df.columns.name = None
     df.sort_values(["ticker", "period_end_date"], inplace=True)
     df.reset_index(drop=True, inplace=True)
+    # Lets add_quarter_features / build_weekly_feature_frame skip re-sorting
+    df.attrs["sorted_by"] = ("ticker", "period_end_date")
     return df
 
 
@@ -244,6 +315,7 @@ def fetch_yahoo_prices_weekly(
         end=end_str,
         auto_adjust=True,
         progress=False,
+        session=_YAHOO_SESSION,
     )
 
     if df.empty:
@@ -267,7 +339,14 @@ def fetch_yahoo_prices_weekly(
         # Normal single-level columns: 'Open','High','Low','Close',...
         close_series = df["Close"]
 
-    # Weekly average (week ending Friday)
+    return _weekly_avg_close(close_series, ticker)
+
+
+def _weekly_avg_close(close_series: pd.Series, ticker: str) -> pd.DataFrame:
+    """
+    Daily close Series -> weekly average close frame (week ending Friday)
+    with columns: ticker, week_end_date, weekly_avg_close.
+    """
     weekly = (
         close_series
         .resample("W-FRI")
@@ -277,12 +356,140 @@ def fetch_yahoo_prices_weekly(
         .reset_index()
     )
 
-    weekly.rename(columns={"Date": "week_end_date"}, inplace=True)
+    weekly.rename(columns={weekly.columns[0]: "week_end_date"}, inplace=True)
     weekly["ticker"] = ticker
     weekly = weekly[["ticker", "week_end_date", "weekly_avg_close"]]
+    # One ticker, resample output is date-ordered
+    weekly.attrs["sorted_by"] = ("ticker", "week_end_date")
 
     return weekly
 
+
+def _cached_prices_cover(
+    cache_path: Path,
+    weekly: pd.DataFrame,
+    start: date,
+    end_date: date,
+) -> bool:
+    """
+    True if a cached weekly price frame answers a request for [start, end_date).
+
+    - First week must be the one containing start (labels are the Friday
+      on or after the first trading day, so at most 6 days after start).
+    - Last week must be the one holding the last trading day before end_date
+      (end_date is exclusive; a weekend/Monday end falls back to Friday).
+    - That last week's average is only final if the file was written after
+      the week closed, or on/after end_date.
+
+    Tickers listed after start never pass the first check and are simply
+    downloaded again.
+    """
+    if weekly.empty:
+        return False
+
+    first = weekly["week_end_date"].iloc[0]
+    last = weekly["week_end_date"].iloc[-1]
+
+    if first > pd.Timestamp(start) + pd.Timedelta(days=6):
+        return False
+    if last < pd.Timestamp(end_date) - pd.Timedelta(days=3):
+        return False
+
+    written = date.fromtimestamp(cache_path.stat().st_mtime)
+    return written > last.date() or written >= end_date
+
+
+def fetch_yahoo_prices_weekly_batch(
+    start_dates: Dict[str, date],
+    end_date: Optional[date] = None,
+    chunk_size: int = YAHOO_BATCH_SIZE,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Same output as fetch_yahoo_prices_weekly, but for many tickers at once.
+
+    start_dates: ticker -> first date we need prices for.
+
+    - Tickers whose cached data/prices/<TICKER>.parquet still covers
+      [start, end_date) skip the network; stale or short caches are
+      downloaded again and overwritten.
+    - The rest are downloaded in chunks with one yf.download call per chunk
+      (space-separated tickers, group_by="ticker").
+    - Tickers Yahoo returns nothing for are simply missing from the result.
+    """
+    if end_date is None:
+        end_date = date.today()
+
+    PRICES_DIR.mkdir(parents=True, exist_ok=True)
+
+    out: Dict[str, pd.DataFrame] = {}
+    to_fetch: List[str] = []
+
+    for ticker, start in start_dates.items():
+        cache_path = PRICES_DIR / f"{ticker}.parquet"
+        if cache_path.exists():
+            cached = pd.read_parquet(cache_path)
+            if _cached_prices_cover(cache_path, cached, start, end_date):
+                cached.attrs["sorted_by"] = ("ticker", "week_end_date")
+                out[ticker] = cached
+                continue
+        to_fetch.append(ticker)
+
+    for i in range(0, len(to_fetch), chunk_size):
+        chunk = to_fetch[i:i + chunk_size]
+        # One request per chunk, so it has to start at the earliest date needed
+        start = min(start_dates[t] for t in chunk)
+
+        df = yf.download(
+            " ".join(chunk),
+            start=start.isoformat(),
+            end=end_date.isoformat(),
+            group_by="ticker",
+            threads=True,
+            auto_adjust=True,
+            progress=False,
+            session=_YAHOO_SESSION,
+        )
+        if df.empty:
+            continue
+
+        df.index = pd.to_datetime(df.index)
+
+        for ticker in chunk:
+            if isinstance(df.columns, pd.MultiIndex):
+                if (ticker, "Close") not in df.columns:
+                    continue
+                close_series = df[(ticker, "Close")]
+            else:
+                # Single ticker chunk may come back with flat columns
+                close_series = df["Close"]
+
+            # Trim back to this ticker's own start date
+            close_series = close_series[close_series.index >= pd.Timestamp(start_dates[ticker])]
+            close_series = close_series.dropna()
+            if close_series.empty:
+                continue
+
+            weekly = _weekly_avg_close(close_series, ticker)
+            weekly.to_parquet(PRICES_DIR / f"{ticker}.parquet", index=False)
+            out[ticker] = weekly
+
+    return out
+
+def pct_change_by_ticker(df: pd.DataFrame, col: str, periods: int) -> np.ndarray:
+    """
+    Same as df.groupby("ticker")[col].pct_change(periods, fill_method=None),
+    for a frame already sorted by ticker: one shift + divide over the whole
+    column, masking rows whose shifted value belongs to another ticker.
+    """
+    values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+    prev = df[col].shift(periods).to_numpy(dtype="float64", na_value=np.nan)
+    same_ticker = (df["ticker"] == df["ticker"].shift(periods)).to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = values / prev - 1.0
+    return np.where(same_ticker, change, np.nan)
+
+
 def add_quarter_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Input: quarterly fundamentals (one row per (ticker, quarter))
@@ -293,10 +500,14 @@ def add_quarter_features(df: pd.DataFrame) -> pd.DataFrame:
     - TTM (trailing twelve months) smooths seasonality and gives a more stable signal.
     - Growth rates (QoQ, YoY) tell the model whether the business is accelerating or slowing,
       which is often more predictive than absolute levels.
+
+    Note: works on df in place (sorts it and adds the feature columns) and
+    returns it; pass a copy if the caller still needs the original.
+    The sort is skipped when df.attrs["sorted_by"] says it is already done.
     """
-    df = df.copy()
-    df.sort_values(["ticker", "period_end_date"], inplace=True)
-    g = df.groupby("ticker", group_keys=False)
+    if df.attrs.get("sorted_by") != ("ticker", "period_end_date"):
+        df.sort_values(["ticker", "period_end_date"], inplace=True)
+        df.attrs["sorted_by"] = ("ticker", "period_end_date")
 
     # Shares outstanding (feature for market cap, P/E, etc.)
     if "Diluted Average Shares" in df.columns:
@@ -306,20 +517,41 @@ def add_quarter_features(df: pd.DataFrame) -> pd.DataFrame:
 
     # TTM fundamentals (rolling 4 quarters)
     # For each fundamental, we build TTM (sum over 4 quarters).
-    for src, ttm in [
-        ("Revenue", "revenue_ttm"),
-        ("Diluted EPS", "eps_ttm"),
-        ("Free Cash Flow", "fcf_ttm"),
-        ("Net Profit", "net_income_ttm"),
-    ]:
-        if src in df.columns:
-            df[ttm] = (
-                g[src]
-                # Rolling window of 4 quarters per ticker.
-                .rolling(window=4, min_periods=1)
-                .sum()
-                .reset_index(level=0, drop=True)
-            )
+    ttm_map = [
+        (src, ttm)
+        for src, ttm in [
+            ("Revenue", "revenue_ttm"),
+            ("Diluted EPS", "eps_ttm"),
+            ("Free Cash Flow", "fcf_ttm"),
+            ("Net Profit", "net_income_ttm"),
+        ]
+        if src in df.columns
+    ]
+    if ttm_map:
+        # All four share the same ticker grouping and window, so do them in one
+        # fused pass: a 4-quarter sum is cumsum[i] - cumsum[lo - 1], where lo is
+        # the later of (i - 3) and the first row of i's ticker (df is sorted by
+        # (ticker, period_end_date)). Same semantics as
+        # rolling(4, min_periods=1).sum(): NaNs are skipped, and a window with
+        # no values at all stays NaN.
+        vals = df[[src for src, _ in ttm_map]].to_numpy(dtype="float64", na_value=np.nan)
+        present = ~np.isnan(vals)
+        n = len(vals)
+
+        zero_row = np.zeros((1, vals.shape[1]))
+        csum = np.concatenate([zero_row, np.cumsum(np.where(present, vals, 0.0), axis=0)])
+        ccount = np.concatenate([zero_row, np.cumsum(present, axis=0)])
+
+        rows = np.arange(n)
+        tickers = df["ticker"].to_numpy()
+        new_group = np.ones(n, dtype=bool)
+        new_group[1:] = tickers[1:] != tickers[:-1]
+        group_start = np.maximum.accumulate(np.where(new_group, rows, 0))
+        lo = np.maximum(group_start, rows - 3)
+
+        ttm_block = csum[rows + 1] - csum[lo]
+        ttm_block[(ccount[rows + 1] - ccount[lo]) == 0] = np.nan
+        df[[ttm for _, ttm in ttm_map]] = ttm_block
 
     # QoQ and YoY growth features
     # Growth is often more predictive than levels:
@@ -327,16 +559,28 @@ def add_quarter_features(df: pd.DataFrame) -> pd.DataFrame:
     # - YoY removes seasonality by comparing same quarter in previous year.
 
     if "Revenue" in df.columns:
-        df["rev_qoq"] = g["Revenue"].pct_change(1, fill_method=None)
-        df["rev_yoy"] = g["Revenue"].pct_change(4, fill_method=None)
+        df["rev_qoq"] = pct_change_by_ticker(df, "Revenue", 1)
+        df["rev_yoy"] = pct_change_by_ticker(df, "Revenue", 4)
 
     if "Diluted EPS" in df.columns:
-        df["eps_qoq"] = g["Diluted EPS"].pct_change(1, fill_method=None)
-        df["eps_yoy"] = g["Diluted EPS"].pct_change(4, fill_method=None)
+        df["eps_qoq"] = pct_change_by_ticker(df, "Diluted EPS", 1)
+        df["eps_yoy"] = pct_change_by_ticker(df, "Diluted EPS", 4)
 
     return df
 
 
+def safe_div(num: pd.Series, den: pd.Series) -> np.ndarray:
+    """
+    Element-wise num / den, NaN wherever den is 0 or missing.
+    One np.divide pass with a where-mask instead of several temporary Series.
+    """
+    n = num.to_numpy(dtype="float64", na_value=np.nan)
+    d = den.to_numpy(dtype="float64", na_value=np.nan)
+    out = np.full(n.shape, np.nan)
+    np.divide(n, d, out=out, where=(d != 0) & ~np.isnan(d))
+    return out
+
+
 def build_weekly_feature_frame(
     fundamentals_df: pd.DataFrame,
     weekly_prices_df: pd.DataFrame,
@@ -348,28 +592,56 @@ def build_weekly_feature_frame(
       - last known fundamentals (TTM, growth, etc.)
       - valuation ratios (P/E, P/S, FCF yield) per week
       - basic price momentum features.
+
+    Both inputs are modified in place (no defensive copies); callers pass
+    frames fresh out of parse_fundamentals_json / the Yahoo fetch.
     """
     # 1) quarterly fundamentals with engineered features
     q_df = add_quarter_features(fundamentals_df)
-
-    q_df = q_df.copy()
-    w_df = weekly_prices_df.copy()
+    w_df = weekly_prices_df
 
     q_df["period_end_date"] = pd.to_datetime(q_df["period_end_date"])
     w_df["week_end_date"] = pd.to_datetime(w_df["week_end_date"])
 
-    q_df.sort_values(["ticker", "period_end_date"], inplace=True)
-    w_df.sort_values(["ticker", "week_end_date"], inplace=True)
+    # Categorical ticker (shared categories on both sides) -> the groupbys
+    # below work on integer codes
+    ticker_dtype = pd.CategoricalDtype(
+        sorted(set(q_df["ticker"]).union(w_df["ticker"]))
+    )
+    q_df["ticker"] = q_df["ticker"].astype(ticker_dtype)
+    w_df["ticker"] = w_df["ticker"].astype(ticker_dtype)
+
+    # add_quarter_features leaves q_df sorted; the (sorted) categories keep
+    # that order. Weekly prices only need sorting if they weren't built
+    # ticker-by-ticker in date order (e.g. a plain concat of several tickers).
+    if w_df.attrs.get("sorted_by") != ("ticker", "week_end_date"):
+        w_df.sort_values(["ticker", "week_end_date"], inplace=True)
+    q_df.reset_index(drop=True, inplace=True)
+    w_df.reset_index(drop=True, inplace=True)
 
     # 2) attach *latest* quarter to each week (backwards in time)
-    weekly = pd.merge_asof(
-        w_df,
-        q_df,
-        left_on="week_end_date",
-        right_on="period_end_date",
-        by="ticker",
-        direction="backward",
-        tolerance=pd.Timedelta(days=max_lag_days),
+    # Per ticker, the last quarter ending on/before a week is just
+    # searchsorted(period_end_dates, week_end_dates, side="right") - 1;
+    # weeks with no quarter within max_lag_days get -1 (-> NaN row below).
+    q_ends = q_df["period_end_date"].to_numpy()
+    w_ends = w_df["week_end_date"].to_numpy()
+    max_lag = np.timedelta64(max_lag_days, "D")
+    q_rows_by_ticker = q_df.groupby("ticker", observed=True, sort=False).indices
+
+    match = np.full(len(w_df), -1, dtype=np.intp)
+    for tk, w_rows in w_df.groupby("ticker", observed=True, sort=False).indices.items():
+        q_rows = q_rows_by_ticker.get(tk)
+        if q_rows is None:
+            continue
+        pos = np.searchsorted(q_ends[q_rows], w_ends[w_rows], side="right") - 1
+        hit = pos >= 0
+        hit[hit] = (w_ends[w_rows][hit] - q_ends[q_rows][pos[hit]]) <= max_lag
+        match[w_rows[hit]] = q_rows[pos[hit]]
+
+    # reindex on -1 (not a label) gives all-NaN rows for unmatched weeks
+    weekly = pd.concat(
+        [w_df, q_df.drop(columns="ticker").reindex(match).reset_index(drop=True)],
+        axis=1,
     )
 
     # no early weeks with only Yahoo prices and no fundamentals
@@ -388,22 +660,19 @@ def build_weekly_feature_frame(
 
     if fundamental_cols:
         # Drop rows where we have none of these fundamentals
-        # removes early history where merge_asof didn't find a quarter
+        # removes early history where no quarter was found
         weekly = weekly.dropna(subset=fundamental_cols, how="all")
 
         # Forward-fill fundamentals within each ticker to fill small gaps / missing fields
         weekly[fundamental_cols] = (
             weekly
-            .groupby("ticker")[fundamental_cols]
+            .groupby("ticker", observed=True, sort=False)[fundamental_cols]
             .ffill()
         )
 
     # 3) valuation ratios per week (using weekly price + TTM fundamentals)
     weekly["price"] = weekly["weekly_avg_close"]
 
-    def safe_div(num, den):
-        return num.where((den != 0) & (~den.isna())) / den
-
     # Market cap = price * shares_outstanding (from latest quarter).
     # This connects price action with company size, important for P/S and FCF yield.
     weekly["market_cap"] = weekly["price"] * weekly["shares_outstanding"]
@@ -418,23 +687,22 @@ def build_weekly_feature_frame(
         weekly["fcf_yield_ttm"] = safe_div(weekly["fcf_ttm"], weekly["market_cap"])
 
     # 4) weekly price momentum features
-    g = weekly.groupby("ticker", group_keys=False)
+    g = weekly.groupby("ticker", observed=True, sort=False, group_keys=False)
 
     # returns
-    weekly["ret_1w"] = g["weekly_avg_close"].pct_change(1, fill_method=None)
-    weekly["ret_4w"] = g["weekly_avg_close"].pct_change(4, fill_method=None)
-    weekly["ret_12w"] = g["weekly_avg_close"].pct_change(12, fill_method=None)
-
-    # SMAs – use transform to preserve index
-    weekly["sma_4w"] = g["weekly_avg_close"].transform(
-        lambda s: s.rolling(4, min_periods=1).mean()
-    )
-    weekly["sma_12w"] = g["weekly_avg_close"].transform(
-        lambda s: s.rolling(12, min_periods=1).mean()
-    )
-    weekly["sma_24w"] = g["weekly_avg_close"].transform(
-        lambda s: s.rolling(24, min_periods=1).mean()
-    )
+    weekly["ret_1w"] = pct_change_by_ticker(weekly, "weekly_avg_close", 1)
+    weekly["ret_4w"] = pct_change_by_ticker(weekly, "weekly_avg_close", 4)
+    weekly["ret_12w"] = pct_change_by_ticker(weekly, "weekly_avg_close", 12)
+
+    # SMAs – grouped rolling (Cython path, no per-group lambda);
+    # dropping the ticker level realigns the result to weekly's index
+    for window in (4, 12, 24):
+        weekly[f"sma_{window}w"] = (
+            g["weekly_avg_close"]
+            .rolling(window, min_periods=1)
+            .mean()
+            .reset_index(level=0, drop=True)
+        )
 
     # SMA relative to price (kind of trend indicators)
     weekly["price_vs_sma_4w"] = safe_div(
@@ -453,14 +721,25 @@ def build_weekly_feature_frame(
         weekly["weekly_avg_close"] = weekly["weekly_avg_close"].round(0).astype("Int64")
 
     # 2) Round all other float columns to 4 decimals
-    for col in weekly.columns:
-        if col != "weekly_avg_close" and pd.api.types.is_float_dtype(weekly[col]):
-            weekly[col] = weekly[col].round(4)
+    float_cols = weekly.select_dtypes(include="floating").columns.difference(["weekly_avg_close"])
+    weekly[float_cols] = weekly[float_cols].round(4)
     # END ROUNDING
 
+    # Back to plain strings so the output frame looks the same to callers
+    weekly["ticker"] = weekly["ticker"].astype(object)
 
     return weekly
 
+@functools.lru_cache(maxsize=1)
+def _load_ticker_sector_map(path_str: str) -> Dict[str, str]:
+    """
+    ticker -> sector from companies.json. Cached so the file is read and
+    parsed once, not once per ticker (key is the resolved path string).
+    """
+    data = orjson.loads(Path(path_str).read_bytes())
+    return {c["ticker"]: c["sector"] for c in data.get("companies", [])}
+
+
 def build_llm_feature_frame(
     weekly: pd.DataFrame,
     companies_json_path: Path | str = Path("companies.json"),
@@ -471,90 +750,38 @@ def build_llm_feature_frame(
     - Replaces ticker with sector (from companies.json).
     - Keeps only the curated set of numeric features.
     - Assumes values are already rounded upstream.
-    """
-    weekly = weekly.copy()
 
-    # Load sector mapping from companies.json
-    companies_json_path = Path(companies_json_path)
-    with companies_json_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    ticker_to_sector = {
-        c["ticker"]: c["sector"]
-        for c in data.get("companies", [])
-    }
+    Only the curated columns of the kept rows are copied, not the whole frame.
+    """
+    # Sector mapping from companies.json (loaded once per process)
+    ticker_to_sector = _load_ticker_sector_map(str(Path(companies_json_path).resolve()))
 
     # Map ticker -> sector
-    weekly["sector"] = weekly["ticker"].map(ticker_to_sector)
+    sector = weekly["ticker"].map(ticker_to_sector)
 
     # If some tickers are missing in companies.json, you can either drop them:
-    weekly = weekly[~weekly["sector"].isna()].copy()
-
-    # Columns to keep for GPT
-    desired_cols = [
-        # identifiers
-        "sector",
-        "week_end_date",
-
-        # price
-        "weekly_avg_close",
-
-        # TTM fundamentals
-        "revenue_ttm",
-        "eps_ttm",
-        "fcf_ttm",
-        "net_income_ttm",
-
-        # growth
-        "rev_qoq",
-        "rev_yoy",
-        "eps_qoq",
-        "eps_yoy",
-
-        # valuation
-        "market_cap",
-        "pe_ttm",
-        "ps_ttm",
-        "fcf_yield_ttm",
-
-        # momentum
-        "ret_1w",
-        "ret_4w",
-        "ret_12w",
-
-        # trend indicators
-        "sma_4w",
-        "sma_12w",
-        "sma_24w",
-        "price_vs_sma_4w",
-        "price_vs_sma_12w",
-        "price_vs_sma_24w",
-
-        # optional quality ratios
-        "Gross Margin %",
-        "Operating Income %",
-        "Net Profit %",
-    ]
+    keep = sector.notna()
 
     # Only keep columns that actually exist (in case some are missing)
-    existing_cols = [c for c in desired_cols if c in weekly.columns]
+    existing_cols = [c for c in LLM_FEATURE_COLS if c in weekly.columns]
 
-    llm_df = weekly[existing_cols].copy()
+    llm_df = weekly.loc[keep, existing_cols]
+    llm_df.insert(0, "sector", sector[keep])
 
     return llm_df
 
-def main_single_ticker(json_path: Path) -> None:
-    fundamentals_df = parse_fundamentals_json(json_path)
-    ticker = fundamentals_df["ticker"].iloc[0]
 
+def price_start_date_for(fundamentals_df: pd.DataFrame) -> date:
     # Choose price start date: a bit before earliest period_end_date
     min_period_date: date = fundamentals_df["period_end_date"].min()
-    price_start_date = min_period_date - relativedelta(years=1)
+    return min_period_date - relativedelta(years=1)
 
-    weekly_prices_df = fetch_yahoo_prices_weekly(
-        ticker=ticker,
-        start_date=price_start_date,
-    )
+
+def write_ticker_outputs(fundamentals_df: pd.DataFrame, weekly_prices_df: pd.DataFrame) -> None:
+    """
+    Build the weekly feature frame for one ticker and write both CSVs.
+    """
+    ticker = fundamentals_df["ticker"].iloc[0]
 
     weekly_features = build_weekly_feature_frame(fundamentals_df, weekly_prices_df)
 
@@ -573,16 +800,52 @@ def main_single_ticker(json_path: Path) -> None:
     llm_df.to_csv(llm_out_path, index=False)
 
 
+def main_single_ticker(json_path: Path) -> None:
+    fundamentals_df = parse_fundamentals_json(json_path)
+    ticker = fundamentals_df["ticker"].iloc[0]
+
+    weekly_prices_df = fetch_yahoo_prices_weekly(
+        ticker=ticker,
+        start_date=price_start_date_for(fundamentals_df),
+    )
+
+    write_ticker_outputs(fundamentals_df, weekly_prices_df)
+
+
 if __name__ == "__main__":
     bing_dir = DATA_ROOT / "bing_financials"
 
     json_files = sorted(bing_dir.glob("*.json"))
     print(f"Found {len(json_files)} JSON files.")
 
+    # 1) Parse all fundamentals first so we know every ticker + start date
+    fundamentals: Dict[str, pd.DataFrame] = {}
     for json_path in json_files:
-        print(f"\n=== Processing {json_path.name} ===")
-
         try:
-            main_single_ticker(json_path)
+            fundamentals_df = parse_fundamentals_json(json_path)
+            fundamentals[fundamentals_df["ticker"].iloc[0]] = fundamentals_df
         except Exception as e:
             print(f"ERROR processing {json_path.name}: {e}")
+
+    # 2) Download prices for all tickers in a few batched Yahoo calls
+    start_dates = {t: price_start_date_for(f) for t, f in fundamentals.items()}
+    weekly_prices = fetch_yahoo_prices_weekly_batch(start_dates)
+
+    # 3) Features + CSV output per ticker, in parallel
+    #    (tickers are independent and workers get their prices as an argument,
+    #    so no worker touches the network)
+    with ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1)) as ex:
+        futures = {}
+        for ticker, fundamentals_df in fundamentals.items():
+            if ticker not in weekly_prices:
+                print(f"ERROR processing {ticker}: No price data returned from Yahoo for {ticker}")
+                continue
+            futures[ex.submit(write_ticker_outputs, fundamentals_df, weekly_prices[ticker])] = ticker
+
+        for fut in as_completed(futures):
+            ticker = futures[fut]
+            try:
+                fut.result()
+                print(f"=== Processed {ticker} ===")
+            except Exception as e:
+                print(f"ERROR processing {ticker}: {e}")
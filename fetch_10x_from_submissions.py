@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 import sys
+import orjson
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -115,7 +116,7 @@ def main() -> int:
     if out_path.exists():
         # Load existing payload
         try:
-            existing_payload = json.loads(out_path.read_text(encoding="utf-8"))
+            existing_payload = orjson.loads(out_path.read_bytes())
             logging.info(
                 "Loaded existing payload with %d filings from %s",
                 existing_payload.get("count", 0),
@@ -155,7 +156,8 @@ def main() -> int:
 
     # Write updated payload back to disk
     logging.info("Writing output: %s", out_path)
-    out_path.write_text(json.dumps(updated_payload, indent=2), encoding="utf-8")
+    # orjson serializes straight to UTF-8 bytes (no str + re-encode pass)
+    out_path.write_bytes(orjson.dumps(updated_payload, option=orjson.OPT_INDENT_2))
 
     logging.info("Done.")
     return 0
@@ -1,12 +1,11 @@
 from __future__ import annotations
 import datetime as dt
-import json
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator
 import sys
-import xml.etree.ElementTree as ET
+import ijson
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -20,8 +19,7 @@ from app.clients.sec_client import SecClient  # type: ignore
 from app.services.submissions_10x_service import Filing10X  # type: ignore
 from src.app.services.filing_download_service import find_instance_xbrl_url  # NEW
 from src.app.services.xbrl_company_totals_service import (  # type: ignore
-    parse_contexts,
-    extract_company_totals_for_main_period,
+    parse_instance,
     print_by_context,
 )
 
@@ -40,40 +38,52 @@ from src.app.services.xbrl_company_totals_service import (  # type: ignore
 #   for one filing and see what the extraction logic actually produces.
 ############################################################
 
-def load_submissions_json(path: Path) -> Dict[str, Any]:
+def iter_submission_filings(path: Path) -> Iterator[Dict[str, Any]]:
     """
-    Load the aggregated 10x_submissions.json file (master 10-K/10-Q dataset).
+    Stream the filing dicts of the aggregated 10x_submissions.json file
+    (master 10-K/10-Q dataset) one at a time.
+
+    ijson reads the file incrementally, so the caller can stop early without
+    the whole (large) document ever being loaded or decoded.
     """
     if not path.exists():
         raise FileNotFoundError(f"Submissions file not found at {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+    with path.open("rb") as fh:
+        yield from ijson.items(fh, "filings.item")
 
-def pick_first_10q(payload: Dict[str, Any]) -> Filing10X:
+def pick_first_10q(filings: Iterable[Dict[str, Any]]) -> Filing10X:
     """
     Pick the first 10-Q filing and convert it into a Filing10X object.
 
     This is intentionally simple: it's just a quick way to grab a real-world
     example filing for XBRL inspection and debugging.
     """
-    filings: List[Dict[str, Any]] = payload.get("filings", [])
-    for f in filings:
-        form = f.get("form") or f.get("form_type")
-        if form and form.startswith("10-Q"):
-            filing_date_str = f.get("filing_date")
-            filing_date = (
-                dt.datetime.strptime(filing_date_str, "%Y-%m-%d").date()
-                if filing_date_str
-                else dt.date.today()
-            )
-            return Filing10X(
-                ticker=f["ticker"],
-                cik=f["cik"],
-                form=form,
-                accession_number=f["accession_number"],
-                primary_document=f["primary_document"],
-                filing_date=filing_date,
-            )
-    raise RuntimeError("No 10-Q filings found in payload.")
+    # Stop at the first 10-Q; only that one's date gets parsed (and with a
+    # streamed input, nothing after it is read)
+    f = next(
+        (
+            f for f in filings
+            if (f.get("form") or f.get("form_type") or "").startswith("10-Q")
+        ),
+        None,
+    )
+    if f is None:
+        raise RuntimeError("No 10-Q filings found in payload.")
+
+    filing_date_str = f.get("filing_date")
+    filing_date = (
+        dt.datetime.strptime(filing_date_str, "%Y-%m-%d").date()
+        if filing_date_str
+        else dt.date.today()
+    )
+    return Filing10X(
+        ticker=f["ticker"],
+        cik=f["cik"],
+        form=f.get("form") or f.get("form_type"),
+        accession_number=f["accession_number"],
+        primary_document=f["primary_document"],
+        filing_date=filing_date,
+    )
 
 
 
@@ -90,8 +100,7 @@ def main() -> int:
     submissions_path = BACKEND_ROOT / "data" / "10x_submissions" / "10x_submissions.json"
     logging.info("Loading submissions from %s", submissions_path)
 
-    payload = load_submissions_json(submissions_path)
-    filing = pick_first_10q(payload)
+    filing = pick_first_10q(iter_submission_filings(submissions_path))
 
     logging.info(
         "Selected 10-Q filing: ticker=%s cik=%s form=%s accession=%s primary=%s",
@@ -102,41 +111,55 @@ def main() -> int:
         filing.primary_document,
     )
 
-    client = SecClient()
-
-    # Try to locate the XBRL instance document
-    logging.info("Searching for XBRL instance document...")
-    instance_url = find_instance_xbrl_url(client, filing)
-
-    if not instance_url:
-        logging.error("No XBRL instance document found for this filing.")
-        return 1
-
-    logging.info("Found instance XBRL: %s", instance_url)
-
-    text = client.fetch_text(instance_url)
-
-    # Save raw XBRL for manual inspection
     target_dir = BACKEND_ROOT / "data" / "10x_raw_xbrl" / filing.ticker.upper()
-    target_dir.mkdir(parents=True, exist_ok=True)
     filename = f"{filing.ticker.upper()}_{filing.accession_number}_{filing.form}_instance.xml"
     out_path = target_dir / filename
-    out_path.write_text(text, encoding="utf-8", errors="ignore")
-
-    logging.info("Saved XBRL instance to %s", out_path)
 
+    # A filing's instance never changes once filed, so a saved copy from an
+    # earlier run is reused as-is (skips both the index lookup and download).
+    if out_path.exists() and out_path.stat().st_size > 0:
+        logging.info("Using saved XBRL instance %s", out_path)
+        # Parse and inspect: contexts and totals in one streaming pass
+        contexts, rows = parse_instance(
+            out_path,
+            ticker=filing.ticker,
+            filing_date=filing.filing_date,
+            limit=500,
+        )
+    else:
+        client = SecClient()
+
+        # Try to locate the XBRL instance document
+        logging.info("Searching for XBRL instance document...")
+        instance_url = find_instance_xbrl_url(client, filing)
+
+        if not instance_url:
+            logging.error("No XBRL instance document found for this filing.")
+            return 1
+
+        logging.info("Found instance XBRL: %s", instance_url)
+
+        # Stream the raw bytes: each chunk is saved (for manual inspection)
+        # and fed to the parser as it arrives, so parsing overlaps the
+        # download. Written to a .part file first so an interrupted download
+        # is never mistaken for a saved instance on the next run.
+        target_dir.mkdir(parents=True, exist_ok=True)
+        part_path = out_path.with_name(out_path.name + ".part")
+        with part_path.open("wb") as fh:
+            def save_and_forward() -> Iterator[bytes]:
+                for chunk in client.iter_bytes(instance_url):
+                    fh.write(chunk)
+                    yield chunk
+
+            contexts, rows = parse_instance(
+                save_and_forward(),
+                ticker=filing.ticker,
+                filing_date=filing.filing_date,
+                limit=500,
+            )
+        part_path.replace(out_path)
 
-    # Parse and inspect
-    root = ET.fromstring(text)
-    contexts = parse_contexts(root)
-
-    rows = extract_company_totals_for_main_period(
-        root=root,
-        contexts=contexts,
-        ticker=filing.ticker,
-        filing_date=filing.filing_date,
-        limit=500,
-    )
+        logging.info("Saved XBRL instance to %s", out_path)
 
     print_by_context(rows, contexts)
 
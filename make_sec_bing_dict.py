@@ -1,15 +1,24 @@
 from __future__ import annotations
+import argparse
 import datetime as dt
+import functools
 import json
 import logging
+import multiprocessing
 import os
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import sys
-import xml.etree.ElementTree as ET
+import ijson
+import numpy as np
+import orjson
+import pandas as pd
 from dotenv import load_dotenv
+from lxml import etree
 
-# ticker -> bing_metric -> sec_concept -> list[relative_error]
+# ticker -> bing_metric -> sec_concept -> (sum of relative errors, hits)
 
 load_dotenv()
 
@@ -18,15 +27,30 @@ SRC_ROOT = BACKEND_ROOT / "src"
 if str(SRC_ROOT) not in sys.path:
     sys.path.append(str(SRC_ROOT))
 
-from app.clients.sec_client import SecClient  # type: ignore
+from app.clients.sec_client import SecClient, share_throttle  # type: ignore
 from app.services.submissions_10x_service import Filing10X  # type: ignore
 from src.app.services.filing_download_service import find_instance_xbrl_url  # type: ignore
 from src.app.services.xbrl_company_totals_service import (  # type: ignore
-    parse_contexts,
-    extract_company_totals_for_main_period,
-    print_by_context,
+    ContextInfo,
+    FactRow,
+    parse_instance,
 )
-EvidenceType = Dict[str, Dict[str, Dict[str, List[float]]]]
+# Running (err_sum, hits) per candidate instead of a list of every error
+ErrAccumulator = Tuple[float, int]
+EvidenceType = Dict[str, Dict[str, Dict[str, ErrAccumulator]]]
+
+# compare_*.txt is flushed every this many finished tickers
+FLUSH_EVERY = 64
+
+# Download threads per worker process (EDGAR I/O overlaps XBRL parsing)
+PREFETCH_THREADS = 4
+
+# Parsed (rows, meta) per filing, keyed by accession number
+PARSED_CACHE_DIR = BACKEND_ROOT / "data" / "10x_parsed_cache"
+# Bumped whenever the pickled FactRow layout or content changes, so stale caches are
+# re-parsed instead of failing to unpickle / carrying stale values
+# (v2: slots dataclasses, v3: concept prefixes from the document's nsmap)
+PARSED_CACHE_VERSION = 3
 
 ############################################################
 # Overview
@@ -62,41 +86,36 @@ EvidenceType = Dict[str, Dict[str, Dict[str, List[float]]]]
 # Helpers
 # ---------------------------------------------------------------------------
 
-def load_submissions_json(path: Path) -> Dict[str, Any]:
+def iter_10q_filings(path: Path, limit: int = 10) -> Iterator[Filing10X]:
     """
-    Load the aggregated 10x_submissions.json file (master 10-K/10-Q dataset).
-    """
-    if not path.exists():
-        raise FileNotFoundError(f"Submissions file not found at {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+    Stream up to `limit` 10-Q filings out of the aggregated
+    10x_submissions.json file (master 10-K/10-Q dataset) as Filing10X objects.
 
-
-def pick_10q_filings(payload: Dict[str, Any], limit: int = 10) -> List[Filing10X]:
-    """
-    From the master submissions payload, pick up to `limit` 10-Q filings
-    and convert them into Filing10X objects.
+    The file is read incrementally with ijson (its C backend when available),
+    so only one filing dict is alive at a time and reading stops as soon as
+    `limit` 10-Qs have been yielded.
 
     This is our working set for building the Bing–SEC mapping.
     """
-    filings = payload.get("filings", [])
-    out = []
-
-    for f in filings:
-        if len(out) >= limit:
-            break
-
-        form = f.get("form") or f.get("form_type")
-        if not (form and form.startswith("10-Q")):
-            continue
+    if not path.exists():
+        raise FileNotFoundError(f"Submissions file not found at {path}")
+    if limit <= 0:
+        return
+
+    count = 0
+    with path.open("rb") as fh:
+        for f in ijson.items(fh, "filings.item"):
+            form = f.get("form") or f.get("form_type")
+            if not (form and form.startswith("10-Q")):
+                continue
 
-        filing_date_str = f.get("filing_date")
-        filing_date = (
-            dt.datetime.strptime(filing_date_str, "%Y-%m-%d").date()
-            if filing_date_str else dt.date.today()
-        )
+            filing_date_str = f.get("filing_date")
+            filing_date = (
+                dt.datetime.strptime(filing_date_str, "%Y-%m-%d").date()
+                if filing_date_str else dt.date.today()
+            )
 
-        out.append(
-            Filing10X(
+            yield Filing10X(
                 ticker=f["ticker"],
                 cik=f["cik"],
                 form=form,
@@ -104,21 +123,38 @@ def pick_10q_filings(payload: Dict[str, Any], limit: int = 10) -> List[Filing10X
                 primary_document=f["primary_document"],
                 filing_date=filing_date,
             )
-        )
 
-    return out
+            count += 1
+            if count >= limit:
+                return
 
 
 def _local_name(tag: str) -> str:
     """
     '{ns}Name' -> 'Name'.
+    Comments / processing instructions (non-str tag under lxml) -> ''.
     """
+    if not isinstance(tag, str):
+        return ""
     if tag.startswith("{"):
         return tag.split("}", 1)[1]
     return tag
 
+def _hits_and_mean_err(hits: Any) -> Tuple[int, float]:
+    """
+    (hits, mean relative error) of one candidate's evidence.
+    """
+    if isinstance(hits, tuple):
+        err_sum, n = hits
+        return n, err_sum / n
+
+    # list of dicts -> use h["rel_err"]; list of floats (or numbers) -> directly
+    errs = [float(h.get("rel_err", 0.0)) if isinstance(h, dict) else float(h) for h in hits]
+    return len(errs), sum(errs) / len(errs)
+
+
 def build_company_sec_mapping(
-    evidence: Dict[str, Dict[str, Dict[str, List[Any]]]],
+    evidence: Dict[str, Dict[str, Dict[str, Any]]],
     min_hits: int = 1,
     max_mean_err: float = 0.05,
 ) -> Dict[str, Dict[str, str]]:
@@ -133,99 +169,96 @@ def build_company_sec_mapping(
       - BUT if none satisfy these thresholds, we still keep the best candidate
         overall (highest hits, then lowest mean_err).
 
-    """
-    mapping: Dict[str, Dict[str, str]] = {}
-
-    for ticker, metrics in evidence.items():
-        ticker_map: Dict[str, str] = {}
-
-        for bing_metric, sec_candidates in metrics.items():
-            stats: List[Tuple[str, int, float]] = []  # (sec_concept, hits, mean_err)
+    Candidates come as (err_sum, hits) accumulators (see EvidenceType); plain
+    lists of errors (floats, or dicts with "rel_err") are still accepted.
+    Candidates are then ranked per (ticker, bing_metric) with one stable
+    pandas sort (preferred first, then hits desc, then mean_err), so ties
+    keep evidence order just like the old per-metric list sort.
+    """
+    records = [
+        (ticker, bing_metric, sec_concept, *_hits_and_mean_err(hits))
+        for ticker, metrics in evidence.items()
+        for bing_metric, sec_candidates in metrics.items()
+        for sec_concept, hits in sec_candidates.items()
+        if hits
+    ]
+    if not records:
+        return {}
 
-            for sec_concept, hits in sec_candidates.items():
-                if not hits:
-                    continue
+    # Record order = evidence order
+    stats = pd.DataFrame.from_records(records, columns=["ticker", "metric", "concept", "hits", "mean_err"])
+    stats["metric_pos"] = stats.groupby(["ticker", "metric"], sort=False).ngroup()
 
-                # hits can be a list of floats or list of dicts with "rel_err"
-                first = hits[0]
-                if isinstance(first, dict):
-                    # list of dicts -> use h["rel_err"]
-                    errs = [float(h.get("rel_err", 0.0)) for h in hits]
-                else:
-                    # list of floats (or numbers) -> use directly
-                    errs = [float(h) for h in hits]
+    # Preferred = satisfy thresholds; if none do, the best overall is kept
+    stats["preferred"] = (stats["hits"] >= min_hits) & (stats["mean_err"] <= max_mean_err)
 
-                if not errs:
-                    continue
+    best = stats.sort_values(
+        ["metric_pos", "preferred", "hits", "mean_err"],
+        ascending=[True, False, False, True],
+        kind="mergesort",
+    ).drop_duplicates("metric_pos")
 
-                mean_err = sum(errs) / len(errs)
-                stats.append((sec_concept, len(hits), mean_err))
-
-            if not stats:
-                continue
+    mapping: Dict[str, Dict[str, str]] = {}
+    for ticker, bing_metric, sec_concept in zip(best["ticker"], best["metric"], best["concept"]):
+        mapping.setdefault(ticker, {})[bing_metric] = sec_concept
 
-            # Best overall: more hits first, then lower error
-            stats.sort(key=lambda x: (-x[1], x[2]))
+    return mapping
 
-            # Preferred = satisfy thresholds
-            preferred = [
-                s for s in stats
-                if s[1] >= min_hits and s[2] <= max_mean_err
-            ]
 
-            if preferred:
-                best_concept, best_hits, best_err = preferred[0]
-            else:
-                # Fallback: still take the best overall candidate
-                best_concept, best_hits, best_err = stats[0]
+# DEI local name -> key in the meta dict returned by parse_xbrl_once()
+DEI_META_FIELDS: Dict[str, str] = {
+    "DocumentPeriodEndDate": "period_end",
+    "DocumentFiscalYearFocus": "fiscal_year",
+    "DocumentFiscalPeriodFocus": "fiscal_period",
+    "DocumentType": "document_type",
+    "AmendmentFlag": "amendment_flag",
+}
 
-            ticker_map[bing_metric] = best_concept
 
-        if ticker_map:
-            mapping[ticker] = ticker_map
+def parse_xbrl_once(
+    xml_bytes: bytes,
+    ticker: str,
+    filing_date: dt.date,
+    limit: int = 500,
+) -> Tuple[Dict[str, Any], Dict[str, ContextInfo], List[FactRow]]:
+    """
+    One streaming pass over an XBRL instance: DEI meta, contexts and the
+    company-total facts of the main period.
 
-    return mapping
+    The pass itself is parse_instance(); the DEI meta fields (first
+    non-empty value per name, see DEI_META_FIELDS) are picked up from the
+    same pass through its on_text hook.
 
-def find_single_dei_fact(root: ET.Element, local_name: str) -> Optional[str]:
-    """
-    Return the (first) text value of a DEI fact with given local name,
-    e.g. 'DocumentFiscalPeriodFocus', 'DocumentFiscalYearFocus', ...
+    Returns (meta, contexts, rows).
     """
-    for el in root.iter():
-        if _local_name(el.tag) == local_name:
-            txt = (el.text or "").strip()
-            if txt:
-                return txt
-    return None
+    meta: Dict[str, Any] = {key: None for key in DEI_META_FIELDS.values()}
 
+    def collect_meta(el: etree._Element, txt: str) -> None:
+        key = DEI_META_FIELDS.get(_local_name(el.tag))
+        if key is not None and meta[key] is None:
+            meta[key] = txt
 
-def get_document_meta(root: ET.Element) -> Dict[str, Any]:
-    """
-    Extract some useful DEI meta we need to align with Bing:
-      - DocumentPeriodEndDate
-      - DocumentFiscalYearFocus
-      - DocumentFiscalPeriodFocus (Q1..Q4)
-      - DocumentType
-      - AmendmentFlag
-    """
-    meta: Dict[str, Any] = {}
-    meta["period_end"] = find_single_dei_fact(root, "DocumentPeriodEndDate")
-    meta["fiscal_year"] = find_single_dei_fact(root, "DocumentFiscalYearFocus")
-    meta["fiscal_period"] = find_single_dei_fact(root, "DocumentFiscalPeriodFocus")
-    meta["document_type"] = find_single_dei_fact(root, "DocumentType")
-    meta["amendment_flag"] = find_single_dei_fact(root, "AmendmentFlag")
-    return meta
+    contexts, rows = parse_instance(
+        xml_bytes,
+        ticker=ticker,
+        filing_date=filing_date,
+        limit=limit,
+        on_text=collect_meta,
+    )
+    return meta, contexts, rows
 
 
+@functools.lru_cache(maxsize=4096)
 def load_bing_financials_for_ticker(ticker: str) -> Optional[Dict[str, Any]]:
     """
     Load our pre-scraped Bing JSON for this ticker, or None if missing.
+    Cached per ticker (a ticker has many 10-Qs); treat the result as read-only.
     """
     path = BACKEND_ROOT / "data" / "bing_financials" / f"{ticker}.json"
     if not path.exists():
         logging.warning("No Bing financials JSON for %s at %s", ticker, path)
         return None
-    return json.loads(path.read_text(encoding="utf-8"))
+    return orjson.loads(path.read_bytes())
 
 
 def parse_bing_number(s: str) -> Optional[float]:
@@ -258,6 +291,46 @@ def parse_bing_number(s: str) -> Optional[float]:
         return None
 
 
+def parse_bing_numbers(raw_values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    parse_bing_number over a whole column at once.
+
+    Comma removal, strip, dash check and the B/M/K suffix are done with
+    numpy.char ops, then one astype(float64) converts the column. If any
+    cell is not a plain number, the column falls back to parse_bing_number
+    per cell.
+
+    Returns (values, ok): ok[i] is False where parse_bing_number would
+    return None (values[i] is NaN there).
+    """
+    n = len(raw_values)
+    if n == 0:
+        return np.empty(0), np.empty(0, dtype=bool)
+
+    s = np.char.strip(np.char.replace(np.array(raw_values, dtype=str), ",", ""))
+    ends_b = np.char.endswith(s, "B")
+    ends_m = np.char.endswith(s, "M")
+    ends_k = np.char.endswith(s, "K")
+    has_suffix = ends_b | ends_m | ends_k
+    multiplier = np.select([ends_b, ends_m, ends_k], [1_000_000_000, 1_000_000, 1_000], 1.0)
+
+    num_part = np.where(has_suffix, np.char.rstrip(s, "BMK"), s)
+    ok = ~((s == "-") | (s == "—") | (s == ""))
+    # Exactly one suffix char may go ("1.2BB" is not a number)
+    ok &= ~has_suffix | (np.char.str_len(s) - np.char.str_len(num_part) == 1)
+    num_part[~ok] = "nan"
+
+    try:
+        values = num_part.astype(np.float64) * multiplier
+    except ValueError:
+        parsed = [parse_bing_number(r) if good else None for r, good in zip(raw_values, ok)]
+        ok = np.fromiter((v is not None for v in parsed), dtype=bool, count=n)
+        values = np.fromiter((np.nan if v is None else v for v in parsed), dtype=np.float64, count=n)
+
+    values[~ok] = np.nan
+    return values, ok
+
+
 def parse_sec_number(s: str) -> Optional[float]:
     """
     Very simple SEC numeric parser – XBRL facts in dollars, possibly with
@@ -372,20 +445,33 @@ def get_bing_all_metrics(bing: Dict[str, Any]) -> Tuple[List[str], Dict[str, Dic
     return periods, merged
 
 
-def pick_bing_period_index(periods: List[str], fiscal_year: str, fiscal_period: str) -> Optional[int]:
+def build_period_suffix_index(periods: List[str]) -> Dict[str, int]:
+    """
+    '2025 (FQ3)' -> index of the first label ending that way ('Jul 2025 (FQ3)'),
+    keyed by the label's last two tokens. Built once per ticker.
+    """
+    out: Dict[str, int] = {}
+    for idx, label in enumerate(periods):
+        suffix = " ".join(label.split()[-2:])
+        out.setdefault(suffix, idx)
+    return out
+
+
+def pick_bing_period_index(
+    period_by_suffix: Dict[str, int],
+    fiscal_year: str,
+    fiscal_period: str,
+) -> Optional[int]:
     """
     MSN uses labels like Jul 2025 (FQ3).
     We have DocumentFiscalYearFocus='2025' and DocumentFiscalPeriodFocus='Q3'.
-    So we look for a label that ends with '2025 (FQ3)'.
+    So we look for a label that ends with '2025 (FQ3)' (one dict lookup in
+    build_period_suffix_index's output).
     """
-    if not fiscal_year or not fiscal_period or not periods:
+    if not fiscal_year or not fiscal_period:
         return None
 
-    suffix = f"{fiscal_year} (F{fiscal_period})"  # e.g. "2025 (FQ3)"
-    for idx, label in enumerate(periods):
-        if label.endswith(suffix):
-            return idx
-    return None
+    return period_by_suffix.get(f"{fiscal_year} (F{fiscal_period})")  # e.g. "2025 (FQ3)"
 
 
 def build_bing_column_values(
@@ -400,7 +486,8 @@ def build_bing_column_values(
         return {}
 
     period_label = periods[period_index]
-    out: Dict[str, float] = {}
+    names: List[str] = []
+    raw: List[str] = []
 
     for metric_name, per_dict in metrics.items():
         if not isinstance(per_dict, dict):
@@ -408,129 +495,373 @@ def build_bing_column_values(
         raw_val = per_dict.get(period_label)
         if not raw_val:
             continue
-        v = parse_bing_number(raw_val)
-        if v is None:
-            continue
-        out[metric_name] = v
+        names.append(metric_name)
+        raw.append(raw_val)
 
-    return out
+    # Whole column in one vectorized pass
+    values, ok = parse_bing_numbers(raw)
+    return {name: float(v) for name, v, good in zip(names, values, ok) if good}
 
 
-def find_close_matches_stepup(
-    sec_value: float,
-    bing_values: Dict[str, float],
+def stepup_match_matrix(
+    sec_vals: np.ndarray,
+    bing_vals: np.ndarray,
     max_tol: float = 0.02,
     step: float = 0.005,
-) -> List[Tuple[str, float, float]]:
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Try matching SEC value to Bing values using increasing relative tolerances.
+    Step-up matching of many SEC values against one Bing column at once.
 
-    Steps:
-        0.5% → 1.0% → ... → 2.0%
+    Builds the full (N SEC x M Bing) relative-error matrix |B - S| / |S| in
+    one broadcast, and bins every error into its tolerance bucket (0.5% →
+    1.0% → ... → 2.0%, one past the end = no match) with one np.digitize.
+    Per SEC value, the Bing values in its lowest occupied bucket are the
+    matches, i.e. exactly what stepping the tolerance up until something
+    matches would return. SEC zeros and Bing zeros never match.
 
-    Returns matches sorted by smallest relative error.
+    Returns (sec_idx, bing_idx, rel_err) of all matches, sorted by rel_err
+    (ties keep SEC order, then Bing order).
     """
-    if sec_value == 0:
-        return []
-
-    tolerances = [i * step for i in range(1, int(max_tol / step) + 1)]
+    tolerances = np.array([i * step for i in range(1, int(max_tol / step) + 1)])
     # Example: if max_tol=0.02 and step=0.005 → [0.005,0.01,0.015,0.02]
 
-    for tol in tolerances:
-        matches = []
-        for mname, bval in bing_values.items():
-            if bval == 0:
-                continue
-            rel_err = abs(bval - sec_value) / abs(sec_value)
-            if rel_err <= tol:
-                matches.append((mname, bval, rel_err))
+    empty = np.empty(0, dtype=np.intp)
+    if sec_vals.size == 0 or bing_vals.size == 0:
+        return empty, empty, np.empty(0)
 
-        if matches:
-            matches.sort(key=lambda x: x[2])
-            return matches
+    abs_sec = np.abs(sec_vals)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel_err = np.abs(bing_vals[None, :] - sec_vals[:, None]) / abs_sec
+    rel_err[np.isnan(rel_err) | (abs_sec == 0) | (bing_vals == 0)[None, :]] = np.inf
+
+    # bucket k <=> tolerances[k-1] < err <= tolerances[k]
+    buckets = np.digitize(rel_err, tolerances, right=True)
+    row_bucket = buckets.min(axis=1, keepdims=True)
+
+    sec_idx, bing_idx = np.nonzero((buckets == row_bucket) & (row_bucket < len(tolerances)))
+    errs = rel_err[sec_idx, bing_idx]
+    # nonzero() is row-major, so a stable sort keeps (SEC, Bing) order on ties
+    order = np.argsort(errs, kind="stable")
+    return sec_idx[order], bing_idx[order], errs[order]
+
+
+BingColumn = Tuple[List[str], np.ndarray]  # (metric names, values in dollars)
+
+
+@functools.lru_cache(maxsize=4096)
+def load_bing_columns_for_ticker(
+    ticker: str,
+) -> Optional[Tuple[List[str], Dict[str, BingColumn], Dict[str, int]]]:
+    """
+    (periods, period_label -> BingColumn, build_period_suffix_index(periods))
+    for every quarter in the ticker's Bing JSON. Built once per ticker, so
+    sibling 10-Qs only look up a column.
+    None if there is no (or an empty) Bing JSON.
+    """
+    bing = load_bing_financials_for_ticker(ticker)
+    if not bing:
+        return None
+
+    periods, metrics = get_bing_all_metrics(bing)
+    columns: Dict[str, BingColumn] = {}
+    for p_idx, period_label in enumerate(periods):
+        col_values = build_bing_column_values(periods, metrics, p_idx)
+        columns[period_label] = (
+            list(col_values),
+            np.fromiter(col_values.values(), dtype=np.float64, count=len(col_values)),
+        )
+    return periods, columns, build_period_suffix_index(periods)
 
-    # no tolerance level produced a match
-    return []
+
+def find_close_matches_stepup(
+    sec_value: float,
+    bing_names: List[str],
+    bing_vals: np.ndarray,
+    max_tol: float = 0.02,
+    step: float = 0.005,
+) -> List[Tuple[str, float, float]]:
+    """
+    Try matching one SEC value to Bing values using increasing relative
+    tolerances (single-row stepup_match_matrix).
+
+    Returns matches sorted by smallest relative error.
+    """
+    _, bing_idx, errs = stepup_match_matrix(
+        np.array([sec_value], dtype=np.float64), bing_vals, max_tol=max_tol, step=step
+    )
+    return [(bing_names[j], float(bing_vals[j]), float(e)) for j, e in zip(bing_idx, errs)]
 
 
 def compare_sec_with_bing(
     ticker: str,
     rows: List[Dict[str, Any]],
-    root: ET.Element,
+    meta: Dict[str, Any],
     evidence: Optional[EvidenceType] = None,
 ) -> str:
     """
     High-level:
-      1. Read DEI meta to know which fiscal year + quarter this 10-Q is.
+      1. Use DEI meta (from parse_xbrl_once) to know which fiscal year + quarter this 10-Q is.
       2. Load Bing JSON for ticker, pick matching column.
       3. Parse SEC and Bing numbers.
       4. For top N SEC facts (by absolute magnitude), try to find matching
          Bing metrics and print a simple comparison.
     """
-    import io
-    buffer = io.StringIO()
+    # Lines are collected and joined once at the end
+    lines: List[str] = []
+    w = lines.append
+
+    def text() -> str:
+        return "\n".join(lines) + "\n"
 
-    def w(s=""):
-        buffer.write(s + "\n")
-    meta = get_document_meta(root)
     fiscal_year = meta.get("fiscal_year")
     fiscal_period = meta.get("fiscal_period")
     w(f"SEC filing metadata: FY={fiscal_year} FP={fiscal_period}")
     if not (fiscal_year and fiscal_period and fiscal_period.startswith("Q")):
         w("Cannot align SEC period with Bing periods.")
-        return buffer.getvalue()
+        return text()
 
-    bing = load_bing_financials_for_ticker(ticker)
-    if not bing:
+    bing_columns = load_bing_columns_for_ticker(ticker)
+    if bing_columns is None:
         w("No Bing JSON found.")
-        return buffer.getvalue()
+        return text()
 
-    periods, metrics = get_bing_all_metrics(bing)
+    periods, columns, period_by_suffix = bing_columns
     # periods: ['Oct 2025 (FQ4)', ...]
-    # metrics: Revenue, Net Profit, Current Assets, Free Cash Flow, ...
+    # columns: period label -> (metric names, values), e.g. Revenue, Net Profit, ...
 
-    p_idx = pick_bing_period_index(periods, fiscal_year, fiscal_period)
+    p_idx = pick_bing_period_index(period_by_suffix, fiscal_year, fiscal_period)
     if p_idx is None:
         w("Could not match period.")
-        return buffer.getvalue()
+        return text()
 
     period_label = periods[p_idx]
     w(f"Matched Bing period column: {period_label}")
 
-    bing_col_values = build_bing_column_values(periods, metrics, p_idx)
+    bing_names, bing_vals = columns[period_label]
     sec_map = build_sec_numeric_map(rows)
     # Sort SEC concepts by absolute value, largest first (most informative)
     sec_items = sorted(sec_map.items(), key=lambda kv: abs(kv[1]), reverse=True)
-    all_matches: List[Tuple[float, str, float, str, float]] = []
+    sec_concepts = [c for c, _ in sec_items]
+    sec_vals = np.fromiter((v for _, v in sec_items), dtype=np.float64, count=len(sec_items))
 
-    for concept, sec_val in sec_items:
-        matches = find_close_matches_stepup(sec_val, bing_col_values)
-        if not matches:
-            continue
-        for mname, bval, err in matches:
-            all_matches.append((err, concept, sec_val, mname, bval))
-
-    # Sort by lowest relative error
-    all_matches.sort(key=lambda x: x[0])
+    # All SEC x Bing pairs in one matrix op, already sorted by lowest relative
+    # error. Matches stay as parallel arrays (SEC index, Bing index, error);
+    # names / values are only looked up where they are used below.
+    sec_idx, bing_idx, errs = stepup_match_matrix(sec_vals, bing_vals)
+    errs_l = errs.tolist()
 
     if evidence is not None:
         t_entry = evidence.setdefault(ticker, {})
-        for err, concept, _, mname, _ in all_matches:
-            m_entry = t_entry.setdefault(mname, {})
-            m_entry.setdefault(concept, []).append(err)
+        for i, j, err in zip(sec_idx.tolist(), bing_idx.tolist(), errs_l):
+            m_entry = t_entry.setdefault(bing_names[j], {})
+            concept = sec_concepts[i]
+            acc = m_entry.get(concept)
+            m_entry[concept] = (err, 1) if acc is None else (acc[0] + err, acc[1] + 1)
 
     w("\n=== Matches (sorted by lowest error) ===\n")
-    for err, concept, sec_val, mname, bval in all_matches:
-        w(f"{concept:60} SEC={sec_val:,.0f}  Bing={mname}:{bval:,.0f}  err={err * 100:4.2f}%")
+    lines.extend(
+        f"{sec_concepts[i]:60} SEC={sec_v:,.0f}  Bing={bing_names[j]}:{bing_v:,.0f}  err={err * 100:4.2f}%"
+        for i, j, err, sec_v, bing_v in zip(
+            sec_idx.tolist(),
+            bing_idx.tolist(),
+            errs_l,
+            sec_vals[sec_idx].tolist(),
+            bing_vals[bing_idx].tolist(),
+        )
+    )
 
-    return buffer.getvalue()
+    return text()
+
+
+# ---------------------------------------------------------------------------
+# Per-filing worker
+# ---------------------------------------------------------------------------
+
+# One SecClient per worker process (set up by _init_worker)
+_worker_client: Optional[SecClient] = None
+
+
+def _init_worker(throttle_lock: Any, throttle_last_call: Any) -> None:
+    global _worker_client
+    share_throttle(throttle_lock, throttle_last_call)
+    _worker_client = SecClient()
+
+
+def merge_evidence(into: EvidenceType, part: EvidenceType) -> None:
+    """
+    Add the per-filing evidence `part` into the global accumulator.
+
+    Parts arrive unpickled from the workers, so every one carries its own
+    copies of the same Bing labels / SEC concept names. New keys are
+    sys.intern()-ed, leaving one shared string per name across all tickers.
+    """
+    for ticker, metrics in part.items():
+        t_entry = into.setdefault(ticker, {})
+        for mname, concepts in metrics.items():
+            m_entry = t_entry.get(mname)
+            if m_entry is None:
+                m_entry = t_entry[sys.intern(mname)] = {}
+            for concept, (err_sum, hits) in concepts.items():
+                acc = m_entry.get(concept)
+                if acc is None:
+                    m_entry[sys.intern(concept)] = (err_sum, hits)
+                else:
+                    m_entry[concept] = (acc[0] + err_sum, acc[1] + hits)
+
+
+def fetch_or_cache(client: SecClient, filing: Filing10X, use_cache: bool = True) -> Optional[bytes]:
+    """
+    Raw XBRL instance bytes for a filing, or None if EDGAR has none.
+
+    The instance is saved under data/10x_raw_xbrl/<TICKER>/ for manual
+    inspection anyway, so on re-runs a non-empty saved copy is read back
+    instead of locating + downloading it again. Bytes go to / come from
+    disk as-is (no decode / re-encode) and lxml parses them directly.
+    """
+    target_dir = BACKEND_ROOT / "data" / "10x_raw_xbrl" / filing.ticker.upper()
+    filename = f"{filing.ticker.upper()}_{filing.accession_number}_{filing.form}_instance.xml"
+    out_path = target_dir / filename
+
+    if use_cache and out_path.exists() and out_path.stat().st_size > 0:
+        return out_path.read_bytes()
+
+    instance_url = find_instance_xbrl_url(client, filing)
+    if not instance_url:
+        return None
+
+    raw = client.fetch_bytes(instance_url)
+
+    # Save raw XBRL for manual inspection
+    target_dir.mkdir(parents=True, exist_ok=True)
+    out_path.write_bytes(raw)
+    return raw
+
+
+def _parsed_cache_path(filing: Filing10X) -> Path:
+    return PARSED_CACHE_DIR / f"{filing.accession_number}.v{PARSED_CACHE_VERSION}.pkl"
+
+
+def process_filing(
+    filing: Filing10X,
+    use_cache: bool = True,
+    prefetched: Optional[Future] = None,
+) -> Tuple[str, str, EvidenceType]:
+    """
+    Download, parse and compare one 10-Q.
+
+    With use_cache, the parsed (rows, meta) from an earlier run is loaded
+    from data/10x_parsed_cache/<accession>.pkl, so only the Bing comparison
+    is redone (e.g. when tuning min_hits / max_mean_err).
+
+    prefetched: a Future already running fetch_or_cache() for this filing
+    (see process_ticker_filings); its result is used instead of fetching here.
+
+    Returns (ticker, text block for the compare_*.txt report, evidence
+    gathered from this filing only).
+    """
+    client = _worker_client or SecClient()
+    ticker = filing.ticker
+    evidence: EvidenceType = {}
+    out: List[str] = [
+        "\n\n===========================================\n",
+        f" TICKER: {ticker} | CIK: {filing.cik} | FORM: {filing.form}\n",
+        "===========================================\n\n",
+    ]
+
+    try:
+        parsed_path = _parsed_cache_path(filing)
+
+        if use_cache and parsed_path.exists():
+            # Filings never change once published -> parsed result is reusable
+            rows, meta = pickle.loads(parsed_path.read_bytes())
+        else:
+            if prefetched is not None:
+                raw = prefetched.result()
+            else:
+                raw = fetch_or_cache(client, filing, use_cache=use_cache)
+            if raw is None:
+                logging.error("No XBRL found for %s", ticker)
+                out.append(f"No XBRL found for {ticker}\n")
+                return ticker, "".join(out), evidence
+
+            # Parse and inspect (DEI meta, contexts and totals in one pass)
+            meta, _, rows = parse_xbrl_once(
+                raw,
+                ticker=filing.ticker,
+                filing_date=filing.filing_date,
+                limit=500,
+            )
+
+            PARSED_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            parsed_path.write_bytes(pickle.dumps((rows, meta), protocol=pickle.HIGHEST_PROTOCOL))
+
+        # capture comparison output
+        sec_vs_bing_text = compare_sec_with_bing(
+            ticker,
+            rows,
+            meta,
+            evidence=evidence,
+        )
+
+        out.append(sec_vs_bing_text)
+        out.append("\n")
+
+    except Exception as exc:
+        # Protect the run so one bad filing doesn't kill it.
+        logging.exception("Error processing %s %s", ticker, filing.form)
+        out.append(f"ERROR processing {ticker}: {exc}\n")
+        out.append("Skipping this filing.\n\n")
+
+    return ticker, "".join(out), evidence
+
+
+def process_ticker_filings(
+    filings: List[Filing10X],
+    use_cache: bool = True,
+) -> Tuple[str, str, EvidenceType]:
+    """
+    process_filing() for all 10-Qs of one ticker in the same worker, so the
+    ticker's Bing columns (load_bing_columns_for_ticker) are built once.
+
+    Downloads for filings without a parsed cache entry are started up front
+    on a few threads (the shared throttle still paces them), so the next
+    filings' EDGAR round-trips overlap with parsing the current one.
+    """
+    client = _worker_client or SecClient()
+    ticker = filings[0].ticker
+    evidence: EvidenceType = {}
+    texts: List[str] = []
+
+    with ThreadPoolExecutor(max_workers=PREFETCH_THREADS) as io_pool:
+        prefetched: List[Optional[Future]] = [
+            None
+            if use_cache and _parsed_cache_path(filing).exists()
+            else io_pool.submit(fetch_or_cache, client, filing, use_cache)
+            for filing in filings
+        ]
+        for filing, raw_future in zip(filings, prefetched):
+            _, filing_text, filing_evidence = process_filing(
+                filing, use_cache=use_cache, prefetched=raw_future
+            )
+            texts.append(filing_text)
+            merge_evidence(evidence, filing_evidence)
+
+    return ticker, "".join(texts), evidence
 
 
 # ---------------------------------------------------------------------------
 # main
 # ---------------------------------------------------------------------------
 
-def main() -> int:
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Learn the Bing metric <-> SEC concept mapping per ticker.")
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore saved raw XBRL / parsed filings and refetch + reparse everything.",
+    )
+    args = ap.parse_args(argv)
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(message)s",
@@ -543,75 +874,48 @@ def main() -> int:
     submissions_path = BACKEND_ROOT / "data" / "10x_submissions" / "10x_submissions.json"
     logging.info("Loading submissions from %s", submissions_path)
 
-    payload = load_submissions_json(submissions_path)
-    filings = pick_10q_filings(payload, limit=10313)
+    filings = list(iter_10q_filings(submissions_path, limit=10313))
     if not filings:
         logging.error("No 10-Q filings found.")
         return 1
 
-    client = SecClient()
     # TXT output file
     out_dir = BACKEND_ROOT / "data" / "sec_bing_compare"
     out_dir.mkdir(parents=True, exist_ok=True)
     txt_path = out_dir / f"compare_{dt.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
     # Global evidence accumulator across all filings and tickers
     evidence: EvidenceType = {}
-    total = len(filings)
-    with txt_path.open("w", encoding="utf-8") as fout:
-        for idx, filing in enumerate(filings, start=1):
-            ticker = filing.ticker
-            fout.write("\n\n===========================================\n")
-            fout.write(f" TICKER: {ticker} | CIK: {filing.cik} | FORM: {filing.form}\n")
-            fout.write("===========================================\n\n")
-
-            logging.info("Processing %s %s (%d/%d)", ticker, filing.form, idx, total)
-
-            try:
-
-                instance_url = find_instance_xbrl_url(client, filing)
-
-                if not instance_url:
-                    logging.error("No XBRL found for %s", ticker)
-                    fout.write(f"No XBRL found for {ticker}\n")
-                    continue
-
-                text = client.fetch_text(instance_url)
-
-                # Save raw XBRL for manual inspection
-                target_dir = BACKEND_ROOT / "data" / "10x_raw_xbrl" / ticker.upper()
-                target_dir.mkdir(parents=True, exist_ok=True)
-                filename = f"{filing.ticker.upper()}_{filing.accession_number}_{filing.form}_instance.xml"
-                out_path = target_dir / filename
-                out_path.write_text(text, encoding="utf-8", errors="ignore")
-
-                # Parse and inspect
-                root = ET.fromstring(text)
-                contexts = parse_contexts(root)
-
-                rows = extract_company_totals_for_main_period(
-                    root=root,
-                    contexts=contexts,
-                    ticker=filing.ticker,
-                    filing_date=filing.filing_date,
-                    limit=500,
-                )
-                # capture comparison output
-                sec_vs_bing_text = compare_sec_with_bing(
-                    ticker,
-                    rows,
-                    root,
-                    evidence=evidence,  # <--- NEW
-                )
-
-                fout.write(sec_vs_bing_text)
-                fout.write("\n")
-
-            except Exception as exc:
-                # Protect the main loop so one bad filing doesn't kill the run.
-                logging.exception("Error processing %s %s", ticker, filing.form)
-                fout.write(f"ERROR processing {ticker}: {exc}\n")
-                fout.write("Skipping this filing.\n\n")
-                continue
+
+    # One task per ticker: everything Bing-side is per ticker, not per filing
+    filings_by_ticker: Dict[str, List[Filing10X]] = {}
+    for filing in filings:
+        filings_by_ticker.setdefault(filing.ticker, []).append(filing)
+    total = len(filings_by_ticker)
+
+    # Tickers are independent, so fetch + parse + compare runs in worker
+    # processes. All workers share one EDGAR request budget (see
+    # share_throttle); evidence fragments are merged here in the parent.
+    throttle_lock = multiprocessing.Lock()
+    throttle_last_call = multiprocessing.Value("d", 0.0)
+
+    # Binary file: each ticker's block is encoded once and written in one go;
+    # flushed every FLUSH_EVERY tickers so progress is still visible on disk.
+    with txt_path.open("wb") as fout, ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(throttle_lock, throttle_last_call),
+    ) as pool:
+        futures = [
+            pool.submit(process_ticker_filings, ticker_filings, use_cache=not args.no_cache)
+            for ticker_filings in filings_by_ticker.values()
+        ]
+        for idx, fut in enumerate(as_completed(futures), start=1):
+            ticker, filing_text, filing_evidence = fut.result()
+            fout.write(filing_text.encode("utf-8"))
+            if idx % FLUSH_EVERY == 0:
+                fout.flush()
+            merge_evidence(evidence, filing_evidence)
+            logging.info("Done %s (%d/%d)", ticker, idx, total)
 
     # After processing all filings, build the final per-ticker mapping
     mapping = build_company_sec_mapping(
@@ -1,8 +1,10 @@
 from __future__ import annotations
-import json
 import logging
+import os
 from pathlib import Path
 
+import orjson
+
 BACKEND_ROOT = Path(__file__).resolve().parents[3]
 
 ############################################################
@@ -38,14 +40,19 @@ BACKEND_ROOT = Path(__file__).resolve().parents[3]
 
 def build_companies_updated() -> Path:
     companies_path = BACKEND_ROOT / "companies.json"
-    data = json.loads(companies_path.read_text(encoding="utf-8"))
+    data = orjson.loads(companies_path.read_bytes())
     original_companies = data.get("companies", [])
 
     # All [ticker].json files we actually have
     bing_dir = BACKEND_ROOT / "data" / "bing_financials"
     bing_dir.mkdir(parents=True, exist_ok=True)
     # Determine which ticker-level scraped JSON files actually exist.
-    existing_ticker_files = {p.stem for p in bing_dir.glob("*.json")}
+    # (one scandir pass: names come straight from the directory listing,
+    # no Path object or stat() per file)
+    with os.scandir(bing_dir) as it:
+        existing_ticker_files = {
+            entry.name[:-5] for entry in it if entry.name.endswith(".json")
+        }
 
     kept_companies = []
     seen_ciks: set[str] = set()         # Track CIKs to deduplicate
@@ -83,7 +90,7 @@ def build_companies_updated() -> Path:
     }
 
     out_path = BACKEND_ROOT / "companies.json"
-    out_path.write_text(json.dumps(updated, indent=2), encoding="utf-8")
+    out_path.write_bytes(orjson.dumps(updated, option=orjson.OPT_INDENT_2))
 
     # --- Reporting ---
     print("=== SUMMARY ===")
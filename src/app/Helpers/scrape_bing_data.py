@@ -3,14 +3,35 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 import logging
-import json
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
+
+import orjson
 
 BACKEND_ROOT = Path(__file__).resolve().parents[3]
 
+# MSN Money landing page with the stock search box
+HOME_URL = "https://www.msn.com/en-US/money?id=a6qja2"
+SEARCH_INPUT_LOCATOR = (By.CSS_SELECTOR, 'input[placeholder="Search stocks, ETFs, & more"]')
+
+# Failures that leave the browser usable (retried in-session); anything
+# else -- dead session, crashed browser -- gets a driver restart.
+PAGE_ERRORS = (TimeoutException, NoSuchElementException, StaleElementReferenceException)
+
+# Browsers driven in parallel by scrape_many_tickers_and_save
+SCRAPE_WORKERS = 4
+
 ############################################################
 # Since there is no stable API, scraping was the only way to
 # consistently discover how each company names its Income
@@ -43,188 +64,354 @@ BACKEND_ROOT = Path(__file__).resolve().parents[3]
 #       backend/data/bing_financials/<TICKER>.json
 #   - Handle per-ticker failures by restarting the WebDriver
 #     so that one broken page doesn’t kill the whole batch.
+#   - Spread the tickers over several worker processes, each
+#     with its own browser.
 ############################################################
 
+# Poll waits every 100 ms instead of Selenium's 500 ms default: most
+# conditions here are met shortly after a click, and the default poll
+# would add up to half a second to each of them.
+WAIT_POLL_SECONDS = 0.1
+
+
+def _wait(driver, timeout: float = 20) -> WebDriverWait:
+    """
+    WebDriverWait with the scraper's polling interval.
+    """
+    return WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_SECONDS)
+
+
+# Selectors, defined once: the Python-side lookups use them directly and the
+# in-page scripts receive them as arguments, so the two can't drift apart.
+BUTTON_SEL = "button"
+POPUP_CLOSE_SEL = "button[aria-label='Close']"
+HEADER_ROW_SEL = "table thead tr"
+PERIOD_TH_SEL = "th[class*='tableHeader-']"
+BODY_SEL = "tbody"
+ROW_SEL = "tbody tr"
+DATA_CELL_SEL = "tbody tr td"
+
+# Consent-box buttons, matched on their whitespace-normalized, lowercased label
+CONSENT_LABELS = ("i accept", "accept", "reject all", "reject")
+CONSENT_BTN_XPATH = "//button[{}]".format(
+    " or ".join(
+        "translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
+        f"'abcdefghijklmnopqrstuvwxyz')='{label}'"
+        for label in CONSENT_LABELS
+    )
+)
+
+FINANCIALS_BTN_LOCATOR = (By.CSS_SELECTOR, 'button[title="Financials"]')
+
+# Financials page controls, keyed by PageRefs field
+_TAB_LOCATORS = {
+    "income_btn": (By.CSS_SELECTOR, 'button[title="Income Statement"]'),
+    "balance_btn": (By.CSS_SELECTOR, 'button[title="Balance Sheet"]'),
+    "cash_btn": (By.CSS_SELECTOR, 'button[title="Cash Flow"]'),
+}
+# Quarterly toggle: attribute-based CSS first (indexed querySelector), the
+# text-matching XPath only as a fallback for layouts without those attributes.
+QUARTERLY_SEL = "button[title='Quarterly'], button[aria-label='Quarterly']"
+_QUARTERLY_CSS_LOCATOR = (By.CSS_SELECTOR, QUARTERLY_SEL)
+_QUARTERLY_XPATH_LOCATOR = (By.XPATH, "//button[contains(normalize-space(.), 'Quarterly')]")
+
+
+@dataclass
+class PageRefs:
+    """
+    Financials-page controls, looked up once per ticker and reused across
+    the three statement tabs (re-found only if MSN re-renders them).
+    """
+    income_btn: WebElement
+    balance_btn: WebElement
+    cash_btn: WebElement
+    quarterly_btn: Optional[WebElement] = None
+
+
+def find_page_refs(driver, wait: WebDriverWait) -> PageRefs:
+    """
+    Resolve the statement tab buttons once the Financials tab has loaded.
+    """
+    income_btn = wait.until(EC.element_to_be_clickable(_TAB_LOCATORS["income_btn"]))
+    return PageRefs(
+        income_btn=income_btn,
+        balance_btn=driver.find_element(*_TAB_LOCATORS["balance_btn"]),
+        cash_btn=driver.find_element(*_TAB_LOCATORS["cash_btn"]),
+    )
+
+
 def close_privacy_and_popups(driver):
-    try:
-        # PRIVACY CONSENT BOX
-        buttons = driver.find_elements(By.CSS_SELECTOR, "button")
-        for btn in buttons:
-            label = btn.text.strip().lower()
-            if label in ("i accept", "accept", "reject all", "reject"):
+    # The consent choice is kept in a cookie, so once it has been clicked
+    # the consent box doesn't come back for the rest of this browser session.
+    # The install popup isn't remembered, so it is checked on every page.
+    if not getattr(driver, "_consent_handled", False):
+        try:
+            # PRIVACY CONSENT BOX (the browser does the label matching: one
+            # query instead of reading the text of every button on the page)
+            buttons = driver.find_elements(By.XPATH, CONSENT_BTN_XPATH)
+            for btn in buttons:
                 try:
                     btn.click()
                     print("Privacy window closed.")
-                    time.sleep(0.7)
+                    _wait_until_gone(driver, btn)
+                    driver._consent_handled = True
                     break
                 except:
                     pass
-    except:
-        pass
+        except:
+            pass
 
     try:
         # --- MSN MONEY INSTALL POPUP
-        close_btns = driver.find_elements(By.CSS_SELECTOR, "button[aria-label='Close']")
+        close_btns = driver.find_elements(By.CSS_SELECTOR, POPUP_CLOSE_SEL)
         for c in close_btns:
             try:
                 c.click()
                 print("Install popup closed.")
-                time.sleep(0.5)
+                _wait_until_gone(driver, c)
                 break
             except:
                 pass
     except:
         pass
 
-def _ensure_quarterly_view(driver, wait: WebDriverWait) -> None:
+def _wait_until_gone(driver, el, timeout: float = 3.0) -> None:
     """
-    Make sure the 'Quarterly' toggle is active.
-    Works across Income Statement, Balance Sheet, Cash Flow.
+    Wait (bounded) for a clicked popup element to be removed or hidden.
     """
     try:
-        # Find the button whose visible text contains "Quarterly"
-        quarterly_btn = wait.until(
-            EC.element_to_be_clickable(
-                (By.XPATH, "//button[contains(normalize-space(.), 'Quarterly')]")
-            )
-        )
+        _wait(driver, timeout).until(EC.invisibility_of_element(el))
     except TimeoutException:
-        logging.warning("Could not find Quarterly toggle – staying in current view.")
-        return
+        pass
 
-    # Small optimization: only click if it's not already the selected view.
-    classes = quarterly_btn.get_attribute("class") or ""
-    if "selected" not in classes.lower():
-        quarterly_btn.click()
-        time.sleep(1.0)  # small pause so the table can refresh
 
-def extract_periods(driver, wait: WebDriverWait) -> list[str]:
-    """
-    Extract period labels from the Financials table header
-    ('Oct 2025 (FQ4)', 'Jul 2025 (FQ3)', ...).
+def _wait_for_table(driver, wait: WebDriverWait, old_tbody=None) -> None:
     """
-    # wait until some table header row exists
-    header_row = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "table thead tr")
-        )
-    )
-
-    # pick only <th> that look like period headers
-    header_cells = header_row.find_elements(
-        By.CSS_SELECTOR,
-        "th[class*='tableHeader-']"
-    )
+    Block until the financials table has (re-)rendered, instead of sleeping a
+    fixed amount after each click.
 
-    periods: list[str] = []
-    for th in header_cells:
-        title = (th.get_attribute("title") or "").strip()
-        text  = th.text.strip()
-        # Prefer the title attribute if present; otherwise fall back to visible text.
-        value = title or text
-        if value:
-            periods.append(value)
+    If `old_tbody` is given, first wait (bounded) for it to be detached;
+    MSN sometimes re-renders in place, so a timeout there is not an error.
+    Then wait until the table has at least one data cell.
+    """
+    if old_tbody is not None:
+        try:
+            _wait(driver, 5).until(EC.staleness_of(old_tbody))
+        except TimeoutException:
+            pass
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, DATA_CELL_SEL)))
 
-    return periods
 
-def extract_financial_table(driver, periods):
+def _find_quarterly_btn(wait: WebDriverWait) -> Optional[WebElement]:
     """
-    Parse the currently visible financials table into a nested dict.
+    Locate the 'Quarterly' toggle (None if the page has none).
     """
-    rows_data = {}
-
-    for row in driver.find_elements(By.CSS_SELECTOR, "tbody tr"):
-
-        # Extract metric name
-        name_td = row.find_elements(By.CSS_SELECTOR, "td:first-child")
-        if not name_td:
-            continue
-
-        name_raw = name_td[0].text.strip()
-        if not name_raw:
-            continue
-
-        # Some rows might contain multiple lines; we only take the first line as label.
-        metric_name = name_raw.splitlines()[0].strip()
-
-        # Extract values from data cells
-        data_tds = row.find_elements(By.CSS_SELECTOR, "td:not(:first-child)")
-
-        values = []
-        for td in data_tds:
-            # Some cells wrap the value in nested <div>s.
-            divs = td.find_elements(By.TAG_NAME, "div")
-
-            if len(divs) >= 1:
-                # Value is always first <div>
-                val = divs[0].text.strip()
-            else:
-                # No divs -> pure value inside <td>
-                val = td.text.strip()
-
-            values.append(val)
-
-        # Remove empty values
-        values = [v for v in values if v != ""]
-
-        if not values:
-            # Empty row
-            continue
-
-        # Normalize length to match period count
-        if len(values) > len(periods):
-            values = values[:len(periods)]
-        elif len(values) < len(periods):
-            values += [""] * (len(periods) - len(values))
+    try:
+        # Find the button whose visible text contains "Quarterly"
+        return wait.until(
+            EC.any_of(
+                EC.element_to_be_clickable(_QUARTERLY_CSS_LOCATOR),
+                EC.element_to_be_clickable(_QUARTERLY_XPATH_LOCATOR),
+            )
+        )
+    except TimeoutException:
+        logging.warning("Could not find Quarterly toggle – staying in current view.")
+        return None
+
+
+# Runs in the page: finds the Quarterly toggle (or uses the cached one passed
+# in), clicks it only if it is not already selected, and reports back
+# [button, clicked, tbody-before-click] -- one WebDriver call in total.
+# Arguments: cached button (or null), QUARTERLY_SEL, BUTTON_SEL, BODY_SEL.
+_QUARTERLY_JS = """
+const [cached, quarterlySel, buttonSel, bodySel] = arguments;
+let btn = cached || document.querySelector(quarterlySel);
+if (!btn) {
+  btn = Array.from(document.querySelectorAll(buttonSel))
+    .find(b => b.textContent.replace(/\\s+/g, " ").includes("Quarterly"));
+}
+if (!btn) return null;
+const tbody = document.querySelector(bodySel);
+if ((btn.getAttribute("class") || "").toLowerCase().includes("selected")) {
+  return [btn, false, tbody];
+}
+btn.click();
+return [btn, true, tbody];
+"""
+
+
+def _ensure_quarterly_view(driver, wait: WebDriverWait, refs: PageRefs) -> None:
+    """
+    Make sure the 'Quarterly' toggle is active.
+    Works across Income Statement, Balance Sheet, Cash Flow.
 
-        rows_data[metric_name] = dict(zip(periods, values))
+    The selected-check and click happen in-page (_QUARTERLY_JS), so the
+    common "already quarterly" case costs a single round-trip. The toggle
+    is cached in `refs` for the next tab.
+    """
+    try:
+        result = driver.execute_script(_QUARTERLY_JS, refs.quarterly_btn, QUARTERLY_SEL, BUTTON_SEL, BODY_SEL)
+    except StaleElementReferenceException:
+        # the tab switch re-rendered the toggle: let the script look it up again
+        result = driver.execute_script(_QUARTERLY_JS, None, QUARTERLY_SEL, BUTTON_SEL, BODY_SEL)
+
+    if result is None:
+        # Not rendered yet: wait for it, then run the check on it
+        quarterly_btn = _find_quarterly_btn(wait)
+        if quarterly_btn is None:
+            refs.quarterly_btn = None
+            return
+        result = driver.execute_script(_QUARTERLY_JS, quarterly_btn, QUARTERLY_SEL, BUTTON_SEL, BODY_SEL)
+
+    quarterly_btn, clicked, old_tbody = result
+    refs.quarterly_btn = quarterly_btn
+    if not clicked:
+        return
 
-    return rows_data
+    # Done once the toggle reports itself selected or the table re-rendered
+    try:
+        wait.until(
+            EC.any_of(
+                EC.staleness_of(old_tbody) if old_tbody is not None else (lambda d: False),
+                lambda d: "selected" in (quarterly_btn.get_attribute("class") or "").lower(),
+            )
+        )
+    except TimeoutException:
+        logging.warning("Quarterly toggle did not confirm – continuing with current table.")
+    _wait_for_table(driver, wait)
+
+
+# Runs in the page: if the statement tab is not already the active one,
+# remember the current <tbody> and click the tab. Returns that <tbody> (to
+# wait on) or null when the tab was already showing and nothing was clicked.
+# Arguments: tab button, BODY_SEL.
+_OPEN_TAB_JS = """
+const [btn, bodySel] = arguments;
+const selected =
+  btn.getAttribute("aria-selected") === "true" ||
+  btn.getAttribute("aria-pressed") === "true" ||
+  (btn.getAttribute("class") || "").toLowerCase().includes("selected");
+if (selected) return null;
+const tbody = document.querySelector(bodySel);
+btn.click();
+return tbody;
+"""
+
+
+def _open_tab(driver, refs: PageRefs, name: str):
+    """
+    Switch to a statement tab (cached in `refs`) and return the <tbody> it is
+    expected to replace.
 
-def scrape_income_statement(driver):
+    The first statement (Income Statement) is normally already showing
+    when Financials opens; then nothing is clicked and None is returned, so
+    its table is read straight away.
     """
-    Navigate to Income Statement tab, ensure quarterly view, and scrape the table.
+    for attempt in range(2):
+        try:
+            return driver.execute_script(_OPEN_TAB_JS, getattr(refs, name), BODY_SEL)
+        except StaleElementReferenceException:
+            if attempt:
+                raise
+            setattr(refs, name, driver.find_element(*_TAB_LOCATORS[name]))
+
+
+# Runs in the page: reads the header periods and every body row in one go
+# and hands back plain JSON, so a whole statement costs one WebDriver call.
+# Everything is scoped to the <table> owning the period header row, so
+# other tables on the page (sidebars, quotes) are never scanned or mixed in.
+# Cell text is read via textContent (no layout pass); only the name cell
+# keeps innerText, since its rendered line breaks separate label / sub-label.
+# Arguments: header row element, PERIOD_TH_SEL, ROW_SEL.
+_EXTRACT_TABLE_JS = """
+const [headRow, periodThSel, rowSel] = arguments;
+const text = (node) => node.textContent.replace(/\\s+/g, " ").trim();
+const table = headRow.closest("table");
+const periods = [];
+for (const th of headRow.querySelectorAll(periodThSel)) {
+  // Prefer the title attribute if present; otherwise fall back to visible text.
+  const value = (th.getAttribute("title") || "").trim() || text(th);
+  if (value) periods.push(value);
+}
+const rows = [];
+for (const tr of table.querySelectorAll(rowSel)) {
+  // First cell is the metric name, the remaining cells are the values.
+  const cells = tr.children;
+  const nameTd = cells[0];
+  if (!nameTd || nameTd.tagName !== "TD") continue;
+  // Some rows contain multiple lines; only the first line is the label.
+  const name = nameTd.innerText.trim().split("\\n")[0].trim();
+  if (!name) continue;
+  const values = [];
+  for (let i = 1; i < cells.length; i++) {
+    const td = cells[i];
+    if (td.tagName !== "TD") continue;
+    // Some cells wrap the value in nested <div>s; the value is the first one.
+    const div = td.querySelector("div");
+    const val = text(div || td);
+    if (val !== "") values.push(val);
+  }
+  rows.push([name, values]);
+}
+return {periods: periods, rows: rows};
+"""
+
+
+def extract_statement(driver, wait: WebDriverWait) -> tuple[list[str], dict]:
     """
-    button = driver.find_element(By.CSS_SELECTOR, 'button[title="Income Statement"]')
-    driver.execute_script("arguments[0].click();", button)
+    Read the currently visible financials table.
 
-    wait = WebDriverWait(driver, 20)
-    _ensure_quarterly_view(driver, wait)
-
-    time.sleep(0.5)  # allow rerender
+    Returns:
+        periods   - header labels ('Oct 2025 (FQ4)', 'Jul 2025 (FQ3)', ...)
+        rows_data - {metric_name: {period: value}}
+    """
+    # wait until some table header row exists; it also anchors the table root
+    header_row = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, HEADER_ROW_SEL)))
+    result = driver.execute_script(_EXTRACT_TABLE_JS, header_row, PERIOD_TH_SEL, ROW_SEL)
+    periods: list[str] = result["periods"]
+
+    # Normalize each row's length to the period count: zip() already stops at
+    # the shorter side, so only short rows need padding (empty rows are skipped).
+    n_periods = len(periods)
+    rows_data = {
+        metric_name: dict(zip(
+            periods,
+            values if len(values) >= n_periods else values + [""] * (n_periods - len(values)),
+        ))
+        for metric_name, values in result["rows"]
+        if values
+    }
 
-    periods = extract_periods(driver, wait)
-    table = extract_financial_table(driver, periods)
-    return periods, table
+    return periods, rows_data
 
-def scrape_balance_sheet(driver):
+def scrape_statement(driver, wait: WebDriverWait, refs: PageRefs, tab: str):
     """
-    Same as scrape_income_statement, but for the Balance Sheet tab.
+    Navigate to one statement tab (`tab` is a PageRefs button field),
+    ensure quarterly view, and scrape the table.
     """
-    button = driver.find_element(By.CSS_SELECTOR, 'button[title="Balance Sheet"]')
-    driver.execute_script("arguments[0].click();", button)
-    wait = WebDriverWait(driver, 20)
-    _ensure_quarterly_view(driver, wait)
+    old_tbody = _open_tab(driver, refs, tab)
+    _wait_for_table(driver, wait, old_tbody)
+    _ensure_quarterly_view(driver, wait, refs)
 
-    time.sleep(0.5)
+    return extract_statement(driver, wait)
 
-    periods = extract_periods(driver, wait)
-    table = extract_financial_table(driver, periods)
-    return periods, table
+def scrape_income_statement(driver, wait: WebDriverWait, refs: PageRefs):
+    """
+    Income Statement tab (see scrape_statement).
+    """
+    return scrape_statement(driver, wait, refs, "income_btn")
 
-def scrape_cash_flow(driver):
+def scrape_balance_sheet(driver, wait: WebDriverWait, refs: PageRefs):
     """
-    Same as scrape_income_statement, but for the Cash Flow tab.
+    Balance Sheet tab (see scrape_statement).
     """
-    button = driver.find_element(By.CSS_SELECTOR, 'button[title="Cash Flow"]')
-    driver.execute_script("arguments[0].click();", button)
-    wait = WebDriverWait(driver, 20)
-    _ensure_quarterly_view(driver, wait)
-    time.sleep(0.5)
+    return scrape_statement(driver, wait, refs, "balance_btn")
 
-    periods = extract_periods(driver, wait)
-    table = extract_financial_table(driver, periods)
-    return periods, table
+def scrape_cash_flow(driver, wait: WebDriverWait, refs: PageRefs):
+    """
+    Cash Flow tab (see scrape_statement).
+    """
+    return scrape_statement(driver, wait, refs, "cash_btn")
 
 
 def scrape_bing_financials_for_driver(driver, wait: WebDriverWait, ticker: str) -> dict:
@@ -232,43 +419,34 @@ def scrape_bing_financials_for_driver(driver, wait: WebDriverWait, ticker: str)
     Core scraper: assumes driver + wait are already initialized and reused.
 
     For a single ticker:
+      - returns to the MSN Money landing page (known state, whatever page
+        the previous ticker left the session on),
       - focuses the MSN Money search box,
       - searches for the ticker,
       - opens the Financials tab,
       - scrapes Income Statement, Balance Sheet, and Cash Flow in Quarterly view.
     """
+    driver.get(HOME_URL)
     close_privacy_and_popups(driver)
     # Locate the main search input inside the top bar.
-    search_input = wait.until(
-        EC.element_to_be_clickable(
-            (
-                By.CSS_SELECTOR,
-                'input[placeholder="Search stocks, ETFs, & more"]'
-            )
-        )
-    )
+    search_input = wait.until(EC.element_to_be_clickable(SEARCH_INPUT_LOCATOR))
 
     # Type ticker and submit
     search_input.clear()
     search_input.send_keys(ticker)
-    time.sleep(0.5)  # tiny pause to let autosuggest appear
 
-    # simplest: just press ENTER
+    # simplest: just press ENTER (the wait below covers the navigation)
     search_input.send_keys(Keys.RETURN)
 
-    financials_btn = wait.until(
-        EC.element_to_be_clickable(
-            (By.CSS_SELECTOR, 'button[title="Financials"]')
-        )
-    )
+    financials_btn = wait.until(EC.element_to_be_clickable(FINANCIALS_BTN_LOCATOR))
 
     # We want to be on the Financials tab before scraping
     financials_btn.click()
-    time.sleep(1.0)
+    refs = find_page_refs(driver, wait)
 
-    income_periods, income = scrape_income_statement(driver)
-    balance_periods, balance = scrape_balance_sheet(driver)
-    cash_periods, cash = scrape_cash_flow(driver)
+    income_periods, income = scrape_income_statement(driver, wait, refs)
+    balance_periods, balance = scrape_balance_sheet(driver, wait, refs)
+    cash_periods, cash = scrape_cash_flow(driver, wait, refs)
 
     # we assume periods are the same across all three tables
     return {
@@ -279,49 +457,78 @@ def scrape_bing_financials_for_driver(driver, wait: WebDriverWait, ticker: str)
         "cash_flow": cash,
     }
 
-def scrape_many_tickers_and_save(tickers: list[str]) -> None:
+def _edge_options() -> webdriver.EdgeOptions:
     """
-    Scrape Bing financials for many tickers.
-    - Restarts WebDriver if one ticker breaks it.
-    - Saves EACH TICKER into its own JSON file.
-    - No single failure can destroy the whole batch.
+    Lightweight headless Edge: we only read table DOM, so images,
+    extensions and the GPU are dead weight (and a smaller browser lets
+    several workers share one machine).
+    """
+    opts = webdriver.EdgeOptions()
+    opts.add_argument("--headless=new")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    # Headless defaults to a small viewport; keep the desktop layout
+    # so the Financials tabs / Quarterly toggle are rendered as usual.
+    opts.add_argument("--window-size=1920,1080")
+    opts.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.cookies": 1,
+        },
+    )
+    # Return from driver.get() on DOMContentLoaded; explicit waits cover the rest
+    opts.page_load_strategy = "eager"
+    return opts
 
-    Files stored in:
-        backend/data/bing_financials/<TICKER>.json
+
+def init_driver():
     """
+    Initialize WebDriver + WebDriverWait, navigate to MSN Money,
+    and close early popups.
+    """
+    d = webdriver.Edge(options=_edge_options())
+    w = _wait(d)
+    d.get(HOME_URL)
+    # Ready once the search box is usable (consent popups render with it)
+    w.until(EC.element_to_be_clickable(SEARCH_INPUT_LOCATOR))
+    close_privacy_and_popups(d)
+    return d, w
 
-    out_dir = BACKEND_ROOT / "data" / "bing_financials"
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    def init_driver():
-        """
-        Initialize WebDriver + WebDriverWait, navigate to MSN Money,
-        and close early popups.
-        """
-        d = webdriver.Edge()
-        w = WebDriverWait(d, 20)
-        d.get("https://www.msn.com/en-US/money?id=a6qja2")
-        time.sleep(2)
-        close_privacy_and_popups(d)
-        return d, w
+def _scrape_shard(tickers: list[str], out_dir: Path) -> int:
+    """
+    Worker body: one browser scrapes its share of the tickers sequentially.
+    - Retries a ticker once: in the same session after a page-level error
+      (PAGE_ERRORS), after restarting its WebDriver for anything else.
+    - Saves EACH TICKER into its own JSON file.
+
+    Returns the number of tickers saved.
+    """
+    # Spawned worker processes start without the parent's logging config
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
 
     driver, wait = init_driver()
 
+    saved = 0
     total = len(tickers)
     for idx, ticker in enumerate(tickers, start=1):
         logging.info("Scraping %s (%d/%d)", ticker, idx, total)
 
-        # where to save this ticker
-        ticker_path = out_dir / f"{ticker}.json"
-
-        # skip if already scraped
-        if ticker_path.exists():
-            logging.info("Skipping %s because %s already exists", ticker, ticker_path.name)
-            continue
-
         # attempt 1
         try:
             data = scrape_bing_financials_for_driver(driver, wait, ticker)
+        except PAGE_ERRORS:
+            # Page-level hiccup (slow render, element re-rendered): the
+            # browser itself is fine, and each attempt starts from HOME_URL,
+            # so retry in the same session instead of paying for a restart.
+            logging.exception("Ticker %s failed — retrying once in the same session", ticker)
+            data = None
         except Exception:
             logging.exception("Ticker %s failed — restarting driver and retrying once", ticker)
 
@@ -332,17 +539,23 @@ def scrape_many_tickers_and_save(tickers: list[str]) -> None:
                 pass
 
             driver, wait = init_driver()
+            data = None
 
-            # attempt 2
+        # attempt 2
+        if data is None:
             try:
                 data = scrape_bing_financials_for_driver(driver, wait, ticker)
             except Exception:
-                logging.exception("Ticker %s FAILED even after restart — skipping", ticker)
+                logging.exception("Ticker %s FAILED on retry — skipping", ticker)
                 continue   # go to next ticker
 
         # success -> save per ticker
-        ticker_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        ticker_path = out_dir / f"{ticker}.json"
+        # orjson serializes straight to UTF-8 bytes; keep the indent so
+        # the files stay readable when checking a scrape by hand
+        ticker_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         logging.info("Saved %s → %s", ticker, ticker_path.name)
+        saved += 1
 
         time.sleep(0.5)  # polite pause
 
@@ -352,7 +565,54 @@ def scrape_many_tickers_and_save(tickers: list[str]) -> None:
     except:
         pass
 
-    logging.info("Finished scraping %d tickers.", total)
+    return saved
+
+
+def scrape_many_tickers_and_save(tickers: list[str], workers: int = SCRAPE_WORKERS) -> None:
+    """
+    Scrape Bing financials for many tickers.
+    - Tickers are independent, so they are dealt round-robin to `workers`
+      processes, each driving its own browser (wall time ~ N / workers).
+    - Each worker restarts its WebDriver if one ticker breaks it.
+    - No single failure can destroy the whole batch.
+
+    Files stored in:
+        backend/data/bing_financials/<TICKER>.json
+    """
+
+    out_dir = BACKEND_ROOT / "data" / "bing_financials"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Skip tickers already scraped: one directory listing up front instead
+    # of a Path + stat() per ticker, and workers only get real work.
+    with os.scandir(out_dir) as it:
+        existing = {entry.name[:-5] for entry in it if entry.name.endswith(".json")}
+    skipped = [t for t in tickers if t in existing]
+    if skipped:
+        logging.info("Skipping %d tickers already in %s", len(skipped), out_dir.name)
+    tickers = [t for t in tickers if t not in existing]
+
+    total = len(tickers)
+    if total == 0:
+        logging.info("Nothing to scrape.")
+        return
+    workers = max(1, min(workers, total))
+
+    if workers == 1:
+        saved = _scrape_shard(tickers, out_dir)
+    else:
+        shards = [tickers[i::workers] for i in range(workers)]
+        saved = 0
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_scrape_shard, shard, out_dir) for shard in shards]
+            for fut in as_completed(futures):
+                try:
+                    saved += fut.result()
+                except Exception:
+                    # a whole worker died (e.g. browser failed to start)
+                    logging.exception("Scraper worker failed")
+
+    logging.info("Finished scraping %d tickers (%d saved).", total, saved)
 
 
 
@@ -377,7 +637,7 @@ def main():
 
     companies_path = BACKEND_ROOT /"companies.json"
 
-    data = json.loads(companies_path.read_text(encoding="utf-8"))
+    data = orjson.loads(companies_path.read_bytes())
 
     # Extract tickers as a flat list
     tickers = [c["ticker"] for c in data.get("companies", [])][198:278]
@@ -394,7 +654,7 @@ def main():
     print("\nQuick check (first ticker):")
 
     first = tickers[0]
-    data = json.loads(out_path.read_text(encoding="utf-8"))[first]
+    data = orjson.loads(out_path.read_bytes())[first]
     print(f"Ticker: {first}")
     print("Periods:", data["periods"])
     print("Income statement metrics:", list(data["income_statement"].keys())[:10])
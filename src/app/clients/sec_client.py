@@ -1,14 +1,18 @@
 from __future__ import annotations
 import datetime as dt
-import gzip
-import io
+import html
 import os
 import re
+from collections import OrderedDict, deque
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin
 
 # ---- config
@@ -17,8 +21,27 @@ _UA = os.getenv("SEC_USER_AGENT", "you@example.com")
 _REFERER = os.getenv("SEC_REFERER", "https://github.com/your/repo")
 _REQ_TIMEOUT = int(os.getenv("SEC_REQ_TIMEOUT", "30"))
 _BACKOFFS = [0.5, 1.0, 2.0, 4.0]  # seconds
-_MIN_DELAY_BETWEEN_CALLS = float(os.getenv("SEC_MIN_DELAY_S", "0.2"))  # gentle pacing
-_last_call = 0.0
+# Optional on-disk cache for /Archives/edgar/data/ pages (immutable once filed)
+_CACHE_DIR = os.getenv("SEC_CACHE_DIR")
+_MEM_CACHE_ENTRIES = 128  # in-process LRU of filing index pages (a few KB each)
+_ARCHIVE_PREFIX = f"{_SEC_BASE}/Archives/edgar/data/"
+_SUBMISSIONS_PREFIX = "https://data.sec.gov/submissions/"
+_POOL_MAXSIZE = 16  # keep-alive connections per host (>= worker threads)
+_MIN_DELAY_BETWEEN_CALLS = float(os.getenv("SEC_MIN_DELAY_S", "0.2"))  # gentle pacing (cross-process)
+# In-process limit: at most this many calls in any 1 s window (SEC allows 10/s)
+_MAX_CALLS_PER_SEC = int(os.getenv("SEC_MAX_RPS", "8"))
+_recent_calls: deque = deque(maxlen=_MAX_CALLS_PER_SEC)  # monotonic start times
+_throttle_lock = threading.Lock()  # one client may be shared by worker threads
+# (lock, shared last-call timestamp) once share_throttle() has been called
+_shared_throttle: Optional[Tuple[Any, Any]] = None
+# <TEXT>...</TEXT> section of an index-headers page
+_TEXT_RE = re.compile(r"<TEXT\b[^>]*>(.*?)</TEXT>", re.I | re.S)
+# <a href="...">text</a> on the index-headers page (the only markup we need)
+_ANCHOR_RE = re.compile(r"<a\b[^>]*?\bhref\s*=\s*[\"']([^\"']+)[\"'][^>]*>(.*?)</a>", re.I | re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+# master.idx filename column: edgar/data/<cik>/<accession>.txt
+_PATH_RE = re.compile(r"edgar/data/(\d+)/([^./]+)")
+_NON_DIGIT_RE = re.compile(r"\D")
 
 ########################################################################################################################
 # Overview
@@ -32,6 +55,10 @@ _last_call = 0.0
 # 1. **Rate-Limited HTTP Client**
 #    - Uses a shared `_throttle()` to ensure we never hit SEC too fast.
 #    - Centralized `_get()` ensures all requests behave consistently.
+#    - `_get_cached()` keeps index pages in a small LRU, and archive
+#      pages + submissions JSON on disk too when SEC_CACHE_DIR is set.
+#    - Cached submissions JSON is revalidated with ETag / Last-Modified
+#      (a 304 reuses the saved body).
 #
 # 2. **Daily Index Support (Legacy)**
 #    - Can fetch SEC’s old daily master index files.
@@ -53,16 +80,62 @@ _last_call = 0.0
 # entry → to full filing URLs (XML/HTML) → to usable content.
 ########################################################################################################################
 
+def share_throttle(lock: Any, last_call: Any) -> None:
+    """
+    Pace this process against a budget shared with other processes.
+
+    lock / last_call are a multiprocessing.Lock and a multiprocessing.Value("d")
+    created once by the parent and handed to every worker (e.g. via a
+    ProcessPoolExecutor initializer), so N workers together still make at
+    most one call per _MIN_DELAY_BETWEEN_CALLS.
+    """
+    global _shared_throttle
+    _shared_throttle = (lock, last_call)
+
+
 def _throttle() -> None:
     """
     Simple global throttle to avoid hitting SEC too fast.
+
+    In-process it is a sliding window: a call waits only if
+    _MAX_CALLS_PER_SEC calls already started within the last second, so
+    naturally spaced requests never sleep and bursts converge to the cap.
     """
-    global _last_call
-    now = time.monotonic()
-    wait = _MIN_DELAY_BETWEEN_CALLS - (now - _last_call)
-    if wait > 0:
-        time.sleep(wait)
-    _last_call = time.monotonic()
+    if _shared_throttle is not None:
+        lock, last_call = _shared_throttle
+        # time.monotonic() is system-wide on Linux, so comparable across processes
+        with lock:
+            wait = _MIN_DELAY_BETWEEN_CALLS - (time.monotonic() - last_call.value)
+            if wait > 0:
+                time.sleep(wait)
+            last_call.value = time.monotonic()
+        return
+
+    with _throttle_lock:
+        now = time.monotonic()
+        if len(_recent_calls) == _MAX_CALLS_PER_SEC:
+            # Oldest of the last N calls must be >= 1 s old before another starts
+            wait = 1.0 - (now - _recent_calls[0])
+            if wait > 0:
+                time.sleep(wait)
+                now = time.monotonic()
+        _recent_calls.append(now)  # maxlen drops the oldest
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write data to path via a temp file in the same directory + os.replace,
+    so an interrupted run never leaves a truncated file that later runs
+    would trust. The temp name is per process / thread, so two workers
+    saving the same URL don't write into each other's file.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def quarter_of(month: int) -> int:
@@ -88,8 +161,26 @@ class SecClient:
      - reuses a single session for connection pooling
     """
 
-    def __init__(self, session: Optional[requests.Session] = None) -> None:
-        self.s = session or requests.Session()
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        if session is None:
+            session = requests.Session()
+            # Keep-alive pool per host (www.sec.gov, data.sec.gov) big enough
+            # that every concurrent worker thread reuses a warm TLS connection
+            # instead of opening (and discarding) a new one.
+            session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_MAXSIZE),
+            )
+        self.s = session
+        if cache_dir is None and _CACHE_DIR:
+            cache_dir = Path(_CACHE_DIR)
+        self.cache_dir = cache_dir
+        self._mem_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._mem_cache_lock = threading.Lock()
         self.s.headers.update(
             {
                 "User-Agent": _UA,
@@ -100,11 +191,18 @@ class SecClient:
 
     # All HTTP traffic to SEC should go through this method so we have
     # a single place to tweak rate limits and retry behavior.
-    def _get(self, url: str) -> requests.Response:
+    def _get(self, url: str, no_retry: Tuple[int, ...] = (), **kwargs: Any) -> requests.Response:
+        """
+        GET with throttle + retries. Statuses in no_retry are raised on the
+        first response instead of going through the backoff loop (for callers
+        that treat them as an answer, e.g. 416 in fetch_range).
+        """
         for i, backoff in enumerate([0.0] + _BACKOFFS):
             _throttle()
             try:
-                r = self.s.get(url, timeout=_REQ_TIMEOUT)
+                r = self.s.get(url, timeout=_REQ_TIMEOUT, **kwargs)
+                if r.status_code in no_retry:
+                    r.raise_for_status()
                 # Retry on 429/5xx
                 if r.status_code in (429, 500, 502, 503, 504):
                     if i == len(_BACKOFFS):
@@ -113,12 +211,91 @@ class SecClient:
                     continue
                 r.raise_for_status()
                 return r
+            except requests.HTTPError as e:
+                if i == len(_BACKOFFS) or (e.response is not None and e.response.status_code in no_retry):
+                    raise
+                time.sleep(backoff)
             except requests.RequestException:
                 if i == len(_BACKOFFS):
                     raise
                 time.sleep(backoff)
         raise RuntimeError("unreachable")
 
+    def _get_cached(self, url: str) -> bytes:
+        """
+        Body of url, reusing earlier responses.
+
+        Archive pages go through the in-process LRU (same accession asked for
+        twice in one run). Submissions JSON skips it: bodies are multi-MB for
+        large filers and each CIK is fetched once per run anyway. With a
+        cache_dir, two kinds of page are also kept on disk across runs:
+          - /Archives/edgar/data/ pages never change once filed, so a saved
+            copy is used as-is: <cache_dir>/<cik>/<accession>/<file>.
+          - submissions JSON changes when the company files, so the saved
+            copy (<cache_dir>/submissions/<file>) is revalidated with a
+            conditional GET and only re-downloaded when SEC says it changed.
+        """
+        use_mem = not url.startswith(_SUBMISSIONS_PREFIX)
+        if use_mem:
+            with self._mem_cache_lock:
+                content = self._mem_cache.get(url)
+                if content is not None:
+                    self._mem_cache.move_to_end(url)
+                    return content
+
+        disk_path = None
+        if self.cache_dir is not None:
+            if url.startswith(_ARCHIVE_PREFIX):
+                disk_path = self.cache_dir / url[len(_ARCHIVE_PREFIX):]
+            elif url.startswith(_SUBMISSIONS_PREFIX):
+                disk_path = self.cache_dir / "submissions" / url[len(_SUBMISSIONS_PREFIX):]
+
+        if disk_path is None:
+            content = self._get(url).content
+        elif url.startswith(_ARCHIVE_PREFIX) and disk_path.is_file():
+            content = disk_path.read_bytes()
+        else:
+            content = self._get_revalidated(url, disk_path)
+
+        if use_mem:
+            with self._mem_cache_lock:
+                self._mem_cache[url] = content
+                if len(self._mem_cache) > _MEM_CACHE_ENTRIES:
+                    self._mem_cache.popitem(last=False)  # least recently used
+        return content
+
+    def _get_revalidated(self, url: str, disk_path: Path) -> bytes:
+        """
+        Conditional GET against a saved copy: sends the stored ETag /
+        Last-Modified, and on 304 Not Modified returns the saved body.
+        The validators live next to the body in <file>.validators.json.
+        """
+        meta_path = disk_path.with_name(disk_path.name + ".validators.json")
+        headers: Dict[str, str] = {}
+        if disk_path.is_file() and meta_path.is_file():
+            meta = orjson.loads(meta_path.read_bytes())
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        r = self._get(url, headers=headers)
+        if r.status_code == 304:
+            return disk_path.read_bytes()
+
+        content = r.content
+        disk_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(disk_path, content)
+        validators = {
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }
+        if any(validators.values()):
+            _write_atomic(meta_path, orjson.dumps(validators))
+        elif meta_path.exists():
+            meta_path.unlink()
+        return content
+
     # ---------------------------------------------------------------------
     # 1) Daily index (kept for compatibility, not used for 10-K/10-Q now)
     # ---------------------------------------------------------------------
@@ -131,8 +308,8 @@ class SecClient:
                     len(content) >= 2 and content[:2] == b"\x1f\x8b"
                 )
                 if is_gz:
-                    with gzip.GzipFile(fileobj=io.BytesIO(content)) as gz:
-                        return gz.read().decode("utf-8", errors="replace")
+                    # wbits=31: gzip header + trailer, one C call (no file wrapper)
+                    return zlib.decompress(content, 31).decode("utf-8", errors="replace")
                 return r.text
             except Exception:
                 # try the next URL (.gz or plain)
@@ -152,8 +329,7 @@ class SecClient:
         """
         cik_padded = str(int(cik)).zfill(10)
         url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
-        r = self._get(url)
-        return r.json()
+        return orjson.loads(self._get_cached(url))  # parses the bytes directly
 
     # ---------------------------------------------------------------------
     # 3) Helpers for finding XML/HTML filings in an accession folder
@@ -171,25 +347,24 @@ class SecClient:
         base_dir = f"{_SEC_BASE}/Archives/edgar/data/{cik_num}/{accession_number}/"
         url = f"{base_dir}{accession_dash}-index-headers.html"
 
-        r = self._get(url)
-        content = r.text
+        content = self._get_cached(url).decode("utf-8", errors="replace")
 
-        # If <TEXT>...</TEXT> wrapping is present, narrow the soup to that section.
+        # If <TEXT>...</TEXT> wrapping is present, narrow the scan to that section.
         # This reduces noise from the rest of the HTML.
-        m = re.search(r"<TEXT\b[^>]*>(.*?)</TEXT>", content, flags=re.I | re.S)
+        m = _TEXT_RE.search(content)
         fragment = m.group(1) if m else content
 
-        soup = BeautifulSoup(fragment, "html.parser")
         xml_url = html_url = None
 
         # Strategy:
-        # - Iterate over all <a> tags.
+        # - Scan the <a> tags with one regex (no parse tree is needed
+        #   just to read hrefs and link text).
         # - Use the link text to detect *.xml and *.htm(l).
         # - Build absolute URLs, bail out once we have both.
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
+        for m in _ANCHOR_RE.finditer(fragment):
+            href = html.unescape(m.group(1).strip())
             abs_url = urljoin(url, href)
-            text = (a.get_text() or "").strip().lower()
+            text = html.unescape(_TAG_RE.sub("", m.group(2))).strip().lower()
             # Case 1: link text says ".xml"
             if xml_url is None and text.endswith(".xml"):
                 xml_url = abs_url
@@ -207,12 +382,13 @@ class SecClient:
         """
         out = []
         for company, form, cik, datefiled, filename in rows:
+            # edgar/data/<cik>/<accession>.txt -> (cik, accession)
+            m = _PATH_RE.search(filename)
             try:
-                parts = filename.split("/")
-                cik_from_path = parts[2]
-                accession = parts[3].replace(".txt", "")
+                if m is None:
+                    raise ValueError(f"unexpected index path: {filename}")
                 xml_url, html_url = self.extract_xml_html_from_headers_page(
-                    cik_from_path, accession
+                    m.group(1), m.group(2)
                 )
             except Exception:
                 xml_url = html_url = None
@@ -225,11 +401,56 @@ class SecClient:
     def fetch_text(self, url: str) -> str:
         return self._get(url).text
 
+    def fetch_index_text(self, url: str) -> str:
+        """fetch_text for filing index pages, served from the cache when possible."""
+        return self._get_cached(url).decode("utf-8", errors="replace")
+
+    def fetch_bytes(self, url: str) -> bytes:
+        """Raw response body (no text decoding), e.g. for XML parsed by lxml."""
+        return self._get(url).content
+
+    def iter_bytes(self, url: str, chunk_size: int = 65536) -> Iterator[bytes]:
+        """
+        Body of url as raw byte chunks while it downloads, e.g. to feed a
+        pull parser so parsing overlaps the transfer.
+        """
+        with self._get(url, stream=True) as r:
+            yield from r.iter_content(chunk_size)
+
+    def stream_to_file(self, url: str, path: Path, chunk_size: int = 131072) -> Path:
+        """
+        Save the body of url to path in 128 KB chunks, as raw bytes, so a
+        multi-MB document is never held (or decoded) in memory whole.
+        """
+        with self._get(url, stream=True) as r, path.open("wb") as fh:
+            for chunk in r.iter_content(chunk_size):
+                fh.write(chunk)
+        return path
+
+    def fetch_range(self, url: str, nbytes: int) -> bytes:
+        """
+        First nbytes of the body via an HTTP Range request, so probing a
+        multi-MB document doesn't download all of it. Servers that ignore
+        Range (200) are sliced; 416 falls back to a plain GET.
+        """
+        try:
+            # identity: the range then covers the document itself, not a gzip stream
+            # 416 is raised straight away (no retries) so the fallback is immediate
+            r = self._get(
+                url,
+                no_retry=(416,),
+                headers={"Range": f"bytes=0-{nbytes - 1}", "Accept-Encoding": "identity"},
+            )
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 416:
+                raise
+            r = self._get(url)
+        return r.content[:nbytes]
 
     @staticmethod
     def _accession_with_dashes(accession_nodash: str) -> str:
         """000164085225000004 -> 0001640852-25-000004"""
-        s = "".join(ch for ch in accession_nodash if ch.isdigit())
+        s = _NON_DIGIT_RE.sub("", accession_nodash)
         if len(s) < 18:  # guard
             return accession_nodash
         return f"{s[:10]}-{s[10:12]}-{s[12:]}"  # 10-2-6
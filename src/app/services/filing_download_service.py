@@ -1,8 +1,9 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from backend.src.app.clients.sec_client import SecClient
 from backend.src.app.services.submissions_10x_service import Filing10X
@@ -22,6 +23,10 @@ from backend.src.app.services.submissions_10x_service import Filing10X
 #     XBRL elements
 ############################################################
 
+PROBE_WORKERS = 4  # concurrent 8 KB probes of candidate XML files
+# Only <a href> tags are built into the soup; the rest of the page is skipped
+_A_STRAINER = SoupStrainer("a", href=True)
+
 def is_instance_xbrl(snippet: str) -> bool:
     snippet = snippet.lower()
     """
@@ -45,10 +50,7 @@ def build_primary_document_url(filing: Filing10X) -> str:
     Pattern:
         https://www.sec.gov/Archives/edgar/data/{cik_int}/{accession_nodash}/{primary_document}
     """
-    cik_int = str(int(filing.cik))  # normalize to unpadded integer string
-    acc_nodash = filing.accession_number.replace("-", "")
-    base = f"https://www.sec.gov/Archives/edgar/data/{cik_int}/{acc_nodash}/"
-    return base + filing.primary_document
+    return build_filing_base_dir(filing) + filing.primary_document
 
 
 def download_primary_html(
@@ -61,17 +63,15 @@ def download_primary_html(
     This is the raw filing HTML the user sees on SEC.
     """
     target_dir.mkdir(parents=True, exist_ok=True)
-    # Build the SEC URL and fetch content
     url = build_primary_document_url(filing)
-    html = client.fetch_text(url)
 
     # build filename
     safe_ticker = filing.ticker.upper()
     fname = f"{safe_ticker}_{filing.accession_number}_{filing.form}.html"
     out_path = target_dir / fname
 
-    out_path.write_text(html, encoding="utf-8")
-    return out_path
+    # Stream the bytes straight to disk (no decode/re-encode of a large 10-K)
+    return client.stream_to_file(url, out_path)
 
 
 def build_filing_base_dir(filing: Filing10X) -> str:
@@ -93,15 +93,15 @@ def find_instance_xbrl_url(client: SecClient, filing: Filing10X) -> Optional[str
        2. Collect all XML files.
        3. Prefer "htm.xml".
        4. For each XML:
-            - fetch only first few KB
+            - fetch only first few KB (HTTP Range)
             - check whether it contains Instance XBRL markers.
     """
     base_dir = build_filing_base_dir(filing)
     # Index page usually contains the full list of attached files.
     index_url = f"{base_dir}{filing.accession_number}-index.html"
 
-    html = client.fetch_text(index_url)
-    soup = BeautifulSoup(html, "html.parser")
+    html = client.fetch_index_text(index_url)
+    soup = BeautifulSoup(html, "lxml", parse_only=_A_STRAINER)
 
     xml_links: List[str] = []
     # Gather all XML links referenced in index HTML
@@ -118,14 +118,34 @@ def find_instance_xbrl_url(client: SecClient, filing: Filing10X) -> Optional[str
     # Ordered list: try preferred first, then everything else.
     ordered = preferred + others
 
-    # For each candidate, look for <xbrli:xbrl> in the first few KB
-    for url in ordered:
+    # For each candidate, look for <xbrli:xbrl> in the first few KB.
+    def probe(url: str) -> bool:
         try:
-            r = client._get(url)
-            snippet = r.content[:8192].decode("utf-8", errors="ignore")
-            if is_instance_xbrl(snippet):
-                return url # Found the true instance document
+            # Range request: only the first 8 KB come over the wire
+            snippet = client.fetch_range(url, 8192).decode("utf-8", errors="ignore")
         except Exception:
-            continue
+            return False
+        return is_instance_xbrl(snippet)
+
+    # The preferred candidate is almost always the instance, so it is probed
+    # alone first; only on a miss are the rest probed concurrently (the client
+    # throttle still paces them). Results are checked in preference order, so
+    # the answer is the same as probing one by one, and the remaining probes
+    # are cancelled once one matches.
+    if probe(ordered[0]):
+        return ordered[0] # Found the true instance document
+
+    rest = ordered[1:]
+    if not rest:
+        return None
+
+    ex = ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(rest)))
+    try:
+        futures = [ex.submit(probe, url) for url in rest]
+        for url, fut in zip(rest, futures):
+            if fut.result():
+                return url # Found the true instance document
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
 
-    return None
\ No newline at end of file
+    return None
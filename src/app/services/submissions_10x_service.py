@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import datetime as dt
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from dataclasses import asdict
 from typing import Set, Tuple
 
@@ -16,6 +18,11 @@ ALLOWED_FORMS_10X: Set[str] = {
     "10-Q/A",
 }
 
+# Concurrent submissions requests in fetch_10x_for_companies. The overall
+# request rate is still capped by the SecClient throttle; the pool only keeps
+# several requests in flight so their network latency overlaps.
+FETCH_WORKERS = 8
+
 ############################################################
 # Overview
 #
@@ -53,10 +60,15 @@ def _parse_recent_filings_10x(
     cik: str,
     ticker: str,
     since: dt.date,
+    assume_sorted: bool = False,
 ) -> List[Filing10X]:
     """
     Parse the filings.recent section of the submissions JSON and return
     all 10-K/10-Q after the given date.
+
+    Every row is checked by default. SEC normally lists recent filings
+    newest first; callers that have verified that can pass
+    assume_sorted=True to stop at the first one on/before 'since'.
     """
     filings = submissions_json.get("filings", {})
     recent = filings.get("recent", {})
@@ -66,31 +78,29 @@ def _parse_recent_filings_10x(
     primary_documents: Sequence[str] = recent.get("primaryDocument", [])
     filing_dates: Sequence[str] = recent.get("filingDate", [])
 
-    # How many complete rows we can safely parse
-    n = min(len(forms), len(accession_numbers), len(primary_documents), len(filing_dates))
-    if n == 0:
-        return []
-
     results: List[Filing10X] = []
-
-    for i in range(n):
-        form = forms[i]
-        if form not in ALLOWED_FORMS_10X:
+    # Locals for the loop (plain fast lookups instead of module globals)
+    allowed_forms = ALLOWED_FORMS_10X
+    fromisoformat = dt.date.fromisoformat
+
+    # zip stops at the shortest array, i.e. only complete rows are parsed
+    for form, accn, primary_doc, date_str in zip(
+        forms, accession_numbers, primary_documents, filing_dates
+    ):
+        if form not in allowed_forms:
             # Ignore everything outside the 10-K/10-Q
             continue
 
-        date_str = filing_dates[i]
         try:
-            fdate = dt.datetime.strptime(date_str, "%Y-%m-%d").date()
+            fdate = fromisoformat(date_str)  # "YYYY-MM-DD", C-implemented
         except ValueError:
             continue
 
         if fdate <= since:
+            if assume_sorted:
+                break  # everything after this is older still
             continue
 
-        accn = accession_numbers[i]
-        primary_doc = primary_documents[i]
-
         results.append(
             Filing10X(
                 ticker=ticker,
@@ -116,7 +126,11 @@ def fetch_10x_for_company(
     after the given 'since' date
     """
     submissions = client.fetch_submissions_json(cik)
-    return _parse_recent_filings_10x(submissions, cik=cik, ticker=ticker, since=since)
+    # filings.recent from the submissions API is newest first, so the scan
+    # can stop at the first filing on/before 'since'
+    return _parse_recent_filings_10x(
+        submissions, cik=cik, ticker=ticker, since=since, assume_sorted=True
+    )
 
 
 def fetch_10x_for_companies(
@@ -126,18 +140,25 @@ def fetch_10x_for_companies(
 ) -> List[Filing10X]:
     """
     Fetch all 10-K / 10-Q filings for a list of (ticker, cik) pairs.
-    Returns a flat list of Filing10X objects.
+    Returns a flat list of Filing10X objects (in company order).
+
+    Requests run on a small thread pool sharing the one client.
     """
     results: List[Filing10X] = []
 
-    for ticker, cik in companies:
-        try:
-            print(ticker)
-            filings = fetch_10x_for_company(client, cik=cik, ticker=ticker, since=since)
-            results.extend(filings)
-        except Exception:
-            #log the exception; for now just continue.
-            continue
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        futures = [
+            (ticker, ex.submit(fetch_10x_for_company, client, cik=cik, ticker=ticker, since=since))
+            for ticker, cik in companies
+        ]
+        # Collect in submission order so the output doesn't depend on timing
+        for ticker, fut in futures:
+            try:
+                print(ticker)
+                results.extend(fut.result())
+            except Exception:
+                #log the exception; for now just continue.
+                continue
 
     return results
 
@@ -149,29 +170,27 @@ def detect_missing_10q_filings(
     """
     Detect which companies are missing expected 10-Q filings.
     """
-    from collections import defaultdict
-
     # Filter only 10-Q and 10-Q/A
     ten_q_forms = {"10-Q", "10-Q/A"}
     now = dt.date.today()
     start_year = now.year - years_back
 
-    # counts[ticker][year] -> number of 10-Q filings
-    counts = defaultdict(lambda: defaultdict(int))
-
-    for f in filings:
-        if f.form in ten_q_forms:
-            year = f.filing_date.year
-            if year >= start_year:
-                counts[f.ticker][year] += 1
+    # counts[(ticker, year)] -> number of 10-Q filings
+    counts: Counter = Counter(
+        (f.ticker, f.filing_date.year)
+        for f in filings
+        if f.form in ten_q_forms and f.filing_date.year >= start_year
+    )
+    # Tickers with at least one 10-Q in the window (first-seen order)
+    tickers = dict.fromkeys(t for t, _ in counts)
 
     missing = {}
 
-    for ticker, years in counts.items():
+    for ticker in tickers:
         missing_years = []
         for y in range(start_year, now.year + 1):
             expected = 3  # typical pattern: 3 × 10-Q + 1 × 10-K per full year
-            actual = years.get(y, 0)
+            actual = counts.get((ticker, y), 0)
             if actual < expected:
                 missing_years.append(y)
         if missing_years:
@@ -193,6 +212,7 @@ def serialize_filing_10x(f: Filing10X) -> Dict[str, Any]:
 def merge_filings_into_payload(
     existing_payload: Dict[str, Any],
     new_filings: List[Filing10X],
+    index: Optional[Dict[Tuple[str, str], int]] = None,
 ) -> tuple[Dict[str, Any], int]:
 
     """ 
@@ -205,28 +225,34 @@ def merge_filings_into_payload(
         "filings": [ { ... }, ... ]
       }
 
+    index maps (ticker, accession_number) -> position in "filings". It is
+    built from the payload when not given and updated in place, so a caller
+    merging into the same payload repeatedly can pass the same dict back in
+    instead of rescanning every existing filing on each call.
     """
     filings_list: List[Dict[str, Any]] = existing_payload.get("filings", [])
 
-    # Build a set of (ticker, accession_number) that we already have
-    existing_keys: Set[Tuple[str, str]] = set()
-    for f in filings_list:
-        t = f.get("ticker")
-        accn = f.get("accession_number")
-        if t and accn:
-            existing_keys.add((t, accn))
+    if index is None:
+        index = {}
+    if not index:
+        # Build the (ticker, accession_number) index of what we already have
+        for pos, f in enumerate(filings_list):
+            t = f.get("ticker")
+            accn = f.get("accession_number")
+            if t and accn:
+                index.setdefault((t, accn), pos)
 
     added_count = 0
     for f in new_filings:
         key = (f.ticker, f.accession_number)
-        if key in existing_keys:
+        if key in index:
             # Already present, skip duplicate.
             continue
+        index[key] = len(filings_list)
         filings_list.append(serialize_filing_10x(f))
-        existing_keys.add(key)
         added_count += 1
 
     existing_payload["filings"] = filings_list
     existing_payload["count"] = len(filings_list)
     # Caller updates "as_of"
-    return existing_payload, added_count
\ No newline at end of file
+    return existing_payload, added_count
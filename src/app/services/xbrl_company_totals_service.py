@@ -1,14 +1,34 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from datetime import date, datetime
-from typing import Optional, Dict, List, Iterable
-import xml.etree.ElementTree as ET
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import functools
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Optional, Dict, List, Iterable, Iterator, NamedTuple, Tuple, Union
+from itertools import chain, repeat
+from pathlib import Path
+import sys
+
+from lxml import etree
 
 # XBRL base namespaces
 XBRLI_NS = "http://www.xbrl.org/2003/instance"
 XBRLDI_NS = "http://xbrl.org/2006/xbrldi"
+LINK_NS = "http://www.xbrl.org/2003/linkbase"
+_XBRLDI_PREFIX = f"{{{XBRLDI_NS}}}"
+# Top-level elements in these namespaces are never facts (contexts, units,
+# schemaRef, footnote links), so their subtrees are skipped without a look.
+_NON_FACT_PREFIXES = tuple(f"{{{ns}}}" for ns in (XBRLI_NS, XBRLDI_NS, LINK_NS))
+
+# Clark-notation tags / paths used per context, built once
+_CONTEXT_TAG = f"{{{XBRLI_NS}}}context"
+_CONTEXT_PATH = f".//{_CONTEXT_TAG}"
+_PERIOD_TAG = f"{{{XBRLI_NS}}}period"
+_START_TAG = f"{{{XBRLI_NS}}}startDate"
+_END_TAG = f"{{{XBRLI_NS}}}endDate"
+_INSTANT_TAG = f"{{{XBRLI_NS}}}instant"
+_SEGMENT_PATH = f"{{{XBRLI_NS}}}entity/{{{XBRLI_NS}}}segment"
+_EXPLICIT_MEMBER_TAG = f"{{{XBRLDI_NS}}}explicitMember"
 
 # We normalize namespaces → short aliases for easier reading.
 NS_ALIASES: Dict[str, str] = {
@@ -42,15 +62,18 @@ NS_ALIASES: Dict[str, str] = {
 # This module does exactly that and outputs simple FactRow objects
 # for downstream processing.
 #
+# Trees are lxml (C parser; huge_tree for multi-MB instances).
+#
 # Main functions:
 #   parse_contexts()
 #   extract_company_totals_for_main_period()
+#   parse_instance()     # both of the above in one streaming pass
+#   parse_many()         # parse_instance() over many files, in processes
 #   print_by_context()   # debug helper
 ############################################################
 
 
-@dataclass
-class ContextInfo:
+class ContextInfo(NamedTuple):
     """
     Represents a single <xbrli:context>.
 
@@ -58,15 +81,21 @@ class ContextInfo:
         - period (start/end or instant)
         - dimensional qualifiers (optional)
         - unique context id
+        - derived flags for fact selection
+
+    A NamedTuple: built once by context_from_element and only read after
+    that, so it's an immutable, compact record (no per-instance dict).
     """
     id: str
-    start_date: Optional[date] = None
-    end_date: Optional[date] = None
-    instant: Optional[date] = None
-    dims: Dict[str, str] = field(default_factory=dict)
+    start_date: Optional[date]
+    end_date: Optional[date]
+    instant: Optional[date]
+    dims: Dict[str, str]
+    is_total: bool                   # no dimensions -> company total
+    end_or_instant: Optional[date]   # end_date, else instant
 
 
-@dataclass
+@dataclass(slots=True)
 class FactRow:
     """
     Represents a single extracted fact belonging to a
@@ -82,77 +111,103 @@ class FactRow:
     instant: Optional[date]
 
 
+# A filing has only a few hundred distinct tags, and the split doesn't depend
+# on the document, so one bounded cache serves a whole multi-filing run
+@functools.lru_cache(maxsize=8192)
+def _split_clark(tag: str) -> Tuple[Optional[str], str]:
+    # lxml splits Clark notation in C (namespace is None if unqualified)
+    qn = etree.QName(tag)
+    return qn.namespace, qn.localname
+
+
 def _split_tag(tag: str) -> tuple[Optional[str], str]:
     """
     Split '{namespace}localname' into (namespace, localname).
     If no namespace, returns (None, tag).
+    Comments / processing instructions (lxml gives them a non-str tag)
+    come back as (None, "").
     """
-    if tag and tag[0] == "{":
-        uri, local = tag[1:].split("}", 1)
-        return uri, local
-    return None, tag
+    if not isinstance(tag, str):
+        return None, ""
+    return _split_clark(tag)
 
 
 def _parse_date(d: Optional[str]) -> Optional[date]:
     if not d:
         return None
-    return datetime.strptime(d, "%Y-%m-%d").date()
+    try:
+        return date.fromisoformat(d.strip())  # C fast path, no format string
+    except ValueError:
+        return None
+
+
+def context_from_element(ctx: etree._Element) -> Optional[ContextInfo]:
+    """
+    Convert one <xbrli:context> element to ContextInfo (None if it has no id).
+    """
+    ctx_id = ctx.attrib.get("id")
+    if not ctx_id:
+        return None
 
+    start_date = end_date = instant = None
 
-def parse_contexts(root: ET.Element) -> Dict[str, ContextInfo]:
+    # period
+    period = ctx.find(_PERIOD_TAG)
+    if period is not None:
+        start_el = period.find(_START_TAG)
+        end_el = period.find(_END_TAG)
+        inst_el = period.find(_INSTANT_TAG)
+
+        # Instance period (single-day fact)
+        if inst_el is not None:
+            instant = _parse_date(inst_el.text)
+        # Duration period (start/end)
+        else:
+            start_date = _parse_date(start_el.text if start_el is not None else None)
+            end_date = _parse_date(end_el.text if end_el is not None else None)
+
+    # dimensions (/entity/segment/explicitMember)
+    dims: Dict[str, str] = {}
+    segment = ctx.find(_SEGMENT_PATH)
+    if segment is not None:
+        # explicitMember is always a direct child of <segment>
+        for mem in segment:
+            if mem.tag != _EXPLICIT_MEMBER_TAG:
+                continue  # typedMember, comments, ...
+            dim = mem.attrib.get("dimension")  # "srt:ProductOrServiceAxis"
+            member = (mem.text or "").strip()  # "us-gaap:ServiceOtherMember"
+            if dim and member:
+                dims[dim] = member
+
+    return ContextInfo(
+        id=ctx_id,
+        start_date=start_date,
+        end_date=end_date,
+        instant=instant,
+        dims=dims,
+        is_total=not dims,
+        end_or_instant=end_date or instant,
+    )
+
+
+def parse_contexts(root: etree._Element) -> Dict[str, ContextInfo]:
     """
     Read all <xbrli:context> elements and convert them to ContextInfo.
     """
     contexts: Dict[str, ContextInfo] = {}
 
     # Find every context in the instance document.
-    for ctx in root.findall(f".//{{{XBRLI_NS}}}context"):
-        ctx_id = ctx.attrib.get("id")
-        if not ctx_id:
-            continue
-
-        info = ContextInfo(id=ctx_id)
-
-        # period
-        period = ctx.find(f"{{{XBRLI_NS}}}period")
-        if period is not None:
-            start_el = period.find(f"{{{XBRLI_NS}}}startDate")
-            end_el = period.find(f"{{{XBRLI_NS}}}endDate")
-            inst_el = period.find(f"{{{XBRLI_NS}}}instant")
-
-            # Instance period (single-day fact)
-            if inst_el is not None:
-                info.instant = _parse_date(inst_el.text)
-            # Duration period (start/end)
-            else:
-                info.start_date = _parse_date(start_el.text if start_el is not None else None)
-                info.end_date = _parse_date(end_el.text if end_el is not None else None)
-
-        # dimensions (/entity/segment/explicitMember)
-        segment = ctx.find(f"{{{XBRLI_NS}}}entity/{{{XBRLI_NS}}}segment")
-        if segment is not None:
-            for mem in segment.findall(f".//{{{XBRLDI_NS}}}explicitMember"):
-                dim = mem.attrib.get("dimension")  # "srt:ProductOrServiceAxis"
-                member = (mem.text or "").strip()  # "us-gaap:ServiceOtherMember"
-                if dim and member:
-                    info.dims[dim] = member
-
-        contexts[ctx_id] = info
+    for ctx in root.iterfind(_CONTEXT_PATH):
+        info = context_from_element(ctx)
+        if info is not None:
+            contexts[info.id] = info
 
     return contexts
 
 
-def get_document_period_end(root: ET.Element) -> Optional[date]:
-    """
-    Locate the dei:DocumentPeriodEndDate fact.
-    This defines the main reporting period.
-    """
-    target_local = "DocumentPeriodEndDate"
-    for el in root.iter():
-        uri, local = _split_tag(el.tag)
-        if local != target_local:
-            continue
-
+def _first_date(elements: Iterable[etree._Element]) -> Optional[date]:
+    """First element whose text is a valid ISO date, as a date."""
+    for el in elements:
         txt = (el.text or "").strip()
         if not txt:
             continue
@@ -163,28 +218,85 @@ def get_document_period_end(root: ET.Element) -> Optional[date]:
     return None
 
 
+def get_document_period_end(root: etree._Element) -> Optional[date]:
+    """
+    Locate the dei:DocumentPeriodEndDate fact.
+    This defines the main reporting period.
+
+    dei facts sit directly under the instance root, so the known dei
+    namespaces (ours + the ones the document declares) are looked up there
+    first; the whole-tree scan is only the fallback.
+    """
+    target_local = "DocumentPeriodEndDate"
+    dei_uris = {uri for uri, alias in NS_ALIASES.items() if alias == "dei"}
+    dei_uris.update(
+        uri for uri in root.nsmap.values() if uri and "xbrl.sec.gov/dei/" in uri
+    )
+    for uri in sorted(dei_uris, reverse=True):  # newest taxonomy year first
+        found = _first_date(root.iterchildren(f"{{{uri}}}{target_local}"))
+        if found is not None:
+            return found
+
+    return _first_date(
+        el
+        for el in root.iter(tag=etree.Element)
+        if _split_tag(el.tag)[1] == target_local
+    )
+
+
 def is_company_total_context(ctx: ContextInfo) -> bool:
     """
     Company-level totals have NO dimensions.
     Dimensions indicate segment-level reporting.
     """
-    return not ctx.dims
+    return ctx.is_total
 
 
-def _concept_name(el: ET.Element) -> str:
+def _build_concept(tag: str, nsmap: Optional[Dict[Optional[str], str]] = None) -> str:
     """
        Convert raw XML tag into a human-readable concept:
            "{http://fasb.org/us-gaap/2025}Revenue" -> "us-gaap:Revenue"
+
+    Prefix: our NS_ALIASES first (stable names for the common taxonomies),
+    then the prefix the document itself declares for the namespace (nsmap,
+    e.g. "us-gaap" for a taxonomy year we don't list yet, "aapl" for a
+    company extension), and only then the last URI path segment.
     """
-    uri, local = _split_tag(el.tag)
+    uri, local = _split_tag(tag)
     if not uri:
         return local
-    prefix = NS_ALIASES.get(uri, uri.split("/")[-1])
+    prefix = NS_ALIASES.get(uri)
+    if prefix is None and nsmap:
+        prefix = next((p for p, u in nsmap.items() if u == uri and p), None)
+    if prefix is None:
+        prefix = uri.split("/")[-1]
     return f"{prefix}:{local}" if prefix else local
 
 
+def _concept_namer() -> Callable[[etree._Element], str]:
+    """
+    Element -> concept name (see _build_concept) for ONE document.
+
+    Results are cached per tag so repeated concepts skip the split / alias
+    lookup / string build, and the element's in-scope prefixes (nsmap) are
+    only read on a cache miss. The cache lives only as long as the returned
+    function: the nsmap fallback makes the answer document-specific, and a
+    filing has just a few hundred distinct tags.
+    """
+    cache: Dict[str, str] = {}
+
+    def concept_name(el: etree._Element) -> str:
+        tag = el.tag
+        concept = cache.get(tag)
+        if concept is None:
+            concept = cache[tag] = _build_concept(tag, el.nsmap)
+        return concept
+
+    return concept_name
+
+
 def extract_company_totals_for_main_period(
-    root: ET.Element,
+    root: etree._Element,
     contexts: Dict[str, ContextInfo],
     ticker: str,
     filing_date: date,
@@ -202,37 +314,193 @@ def extract_company_totals_for_main_period(
     doc_end = get_document_period_end(root)
     rows: List[FactRow] = []
 
-    for el in root.iter():
-        # Must have contextRef attribute
-        ctx_id = el.attrib.get("contextRef")
-        if not ctx_id:
+    # Contexts that pass every context-level rule, decided once up front:
+    # no dimensions (company totals) and, if we could find it, period
+    # ending on the main reporting date.
+    eligible_ctx = frozenset(
+        cid
+        for cid, c in contexts.items()
+        if c.is_total and (doc_end is None or c.end_or_instant == doc_end)
+    )
+
+    # Hot-loop names as locals (LOAD_FAST instead of global lookups)
+    fact_row = FactRow
+    concept_name = _concept_namer()
+    rows_append = rows.append
+    xbrldi_prefix = _XBRLDI_PREFIX
+
+    # Candidate elements: every element (tag=etree.Element skips comments /
+    # PIs in C) under top-level children that can hold facts. Contexts and
+    # units are the bulk of a non-fact tree and are never entered.
+    candidates = chain.from_iterable(
+        top.iter(tag=etree.Element)
+        for top in root.iterchildren(tag=etree.Element)
+        if not top.tag.startswith(_NON_FACT_PREFIXES)
+    )
+
+    for el in candidates:
+        # Must reference an eligible context (a single set lookup; elements
+        # without contextRef get None, which is never in the set)
+        ctx_id = el.get("contextRef")
+        if ctx_id not in eligible_ctx:
             continue
 
         # Skip explicitMember and other pure-dimensional elements
-        if XBRLDI_NS in el.tag:
+        if el.tag.startswith(xbrldi_prefix):
             continue
 
-        # Must have a text value
-        txt = (el.text or "").strip()
+        # Must have a text value (most fact values carry no surrounding
+        # whitespace, so only strip when an end actually needs it)
+        txt = el.text
+        if txt is None:
+            continue
+        if txt[:1].isspace() or txt[-1:].isspace():
+            txt = txt.strip()
         if not txt:
             continue
 
-        # Context must exist
-        ctx = contexts.get(ctx_id)
-        if not ctx:
-            continue
+        ctx = contexts[ctx_id]
 
-        # Only company totals (no dimensions)
-        if not is_company_total_context(ctx):
-            continue
+        rows_append(
+            fact_row(
+                ticker=ticker,
+                filing_date=filing_date,
+                context_id=ctx.id,
+                concept=concept_name(el),
+                value=txt,
+                period_start=ctx.start_date,
+                period_end=ctx.end_date,
+                instant=ctx.instant,
+            )
+        )
+
+        if len(rows) >= limit:
+            break
+
+    return rows
+
+
+_READ_CHUNK = 65536  # bytes per read when parse_instance streams a file
+
+
+def _iter_chunks(src: Union[bytes, str, Path, Iterable[bytes]]) -> Iterator[bytes]:
+    """Raw bytes, a file path (read in chunks) or an iterable of byte chunks."""
+    if isinstance(src, bytes):
+        yield src
+    elif isinstance(src, (str, Path)):
+        with open(src, "rb") as fh:
+            yield from iter(lambda: fh.read(_READ_CHUNK), b"")
+    else:
+        yield from src
+
+
+def _iter_parse_events(
+    src: Union[bytes, str, Path, Iterable[bytes]],
+) -> Iterator[Tuple[str, etree._Element]]:
+    """
+    (event, element) pairs for src from a pull parser: bytes are fed as they
+    arrive, so with a network stream parsing overlaps the download.
+    """
+    parser = etree.XMLPullParser(events=("start", "end"), huge_tree=True, recover=True)
+    for chunk in _iter_chunks(src):
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def parse_instance(
+    src: Union[bytes, str, Path, Iterable[bytes]],
+    ticker: str,
+    filing_date: date,
+    limit: int = 300,
+    on_text: Optional[Callable[[etree._Element, str], None]] = None,
+) -> Tuple[Dict[str, ContextInfo], List[FactRow]]:
+    """
+    One streaming pass over an XBRL instance (raw bytes, a file path, or an
+    iterable of byte chunks such as an HTTP response stream) that
+    gives the same results as parse_contexts() +
+    extract_company_totals_for_main_period(), without building the tree.
 
-        # Restrict to main reporting period (if we could find it)
-        if doc_end is not None:
-            end_or_inst = ctx.end_date or ctx.instant
-            if end_or_inst != doc_end:
-                continue
+    Each top-level element (context, fact, ...) is handled at its end event
+    and then cleared / detached. Facts are buffered as (context id, concept,
+    text) and filtered at the end, because contexts and
+    DocumentPeriodEndDate may appear after them.
 
-        concept = _concept_name(el)
+    on_text(el, text) is called for every element with non-empty text, for
+    callers that want more out of the same pass (e.g. other dei fields).
+
+    Returns (contexts, rows).
+    """
+    contexts: Dict[str, ContextInfo] = {}
+    facts: List[Tuple[str, str, str]] = []
+    period_end_candidates: List[str] = []
+
+    # Per-element names as locals (LOAD_FAST instead of global lookups)
+    concept_name = _concept_namer()
+    split_tag = _split_tag
+    facts_append = facts.append
+    xbrldi_prefix = _XBRLDI_PREFIX
+    context_tag = _CONTEXT_TAG
+    non_fact_prefixes = _NON_FACT_PREFIXES
+    depth = 0
+    for event, elem in _iter_parse_events(src):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue  # handled with its top-level ancestor below
+
+        if elem.tag == context_tag:
+            info = context_from_element(elem)
+            if info is not None:
+                contexts[info.id] = info
+        elif elem.tag.startswith(non_fact_prefixes):
+            pass  # units, schemaRef, footnote links: no facts inside
+        else:
+            for el in elem.iter(tag=etree.Element):
+                # Strip only when an end needs it (fact values rarely do)
+                txt = el.text
+                if txt is None:
+                    continue
+                if txt[:1].isspace() or txt[-1:].isspace():
+                    txt = txt.strip()
+                if not txt:
+                    continue
+                if on_text is not None:
+                    on_text(el, txt)
+
+                if split_tag(el.tag)[1] == "DocumentPeriodEndDate":
+                    period_end_candidates.append(txt)
+
+                ctx_id = el.get("contextRef")
+                if ctx_id and not el.tag.startswith(xbrldi_prefix):
+                    facts_append((ctx_id, concept_name(el), txt))
+
+        # Free what we've consumed (lxml keeps siblings alive otherwise)
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+    # Same rule as get_document_period_end: first value that is a valid date
+    doc_end: Optional[date] = None
+    for txt in period_end_candidates:
+        try:
+            doc_end = date.fromisoformat(txt)
+            break
+        except ValueError:
+            continue
+
+    rows: List[FactRow] = []
+    for ctx_id, concept, txt in facts:
+        ctx = contexts.get(ctx_id)
+        if not ctx or not ctx.is_total:
+            continue
+        if doc_end is not None and ctx.end_or_instant != doc_end:
+            continue
 
         rows.append(
             FactRow(
@@ -246,11 +514,33 @@ def extract_company_totals_for_main_period(
                 instant=ctx.instant,
             )
         )
-
         if len(rows) >= limit:
             break
 
-    return rows
+    return contexts, rows
+
+
+def _parse_one(job: Tuple[Union[str, Path], str, date, int]) -> List[FactRow]:
+    """parse_instance() for one (path, ticker, filing_date, limit) job."""
+    path, ticker, filing_date, limit = job
+    return parse_instance(path, ticker=ticker, filing_date=filing_date, limit=limit)[1]
+
+
+def parse_many(
+    paths: Iterable[Union[str, Path]],
+    tickers: Iterable[str],
+    filing_dates: Iterable[date],
+    limit: int = 300,
+    workers: Optional[int] = None,
+) -> List[List[FactRow]]:
+    """
+    parse_instance() over many saved instances on a process pool (the parse
+    is CPU-bound and holds the GIL, so threads wouldn't help).
+    Returns the rows per filing, in input order.
+    """
+    jobs = zip(paths, tickers, filing_dates, repeat(limit))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_parse_one, jobs, chunksize=8))
 
 
 # ---------------------- DEBUG / INSPECTION HELPERS ----------------------
@@ -258,11 +548,15 @@ def extract_company_totals_for_main_period(
 
 def _group_rows_by_context(rows: Iterable[FactRow]):
     """
-    Group extracted facts by context_id.
+    Group extracted facts by context_id, contexts in first-appearance
+    (document) order.
     """
-    grouped = defaultdict(list)
+    grouped: Dict[str, List[FactRow]] = {}
     for r in rows:
-        grouped[r.context_id].append(r)
+        facts = grouped.get(r.context_id)
+        if facts is None:
+            facts = grouped[r.context_id] = []
+        facts.append(r)
     return grouped
 
 
@@ -272,8 +566,11 @@ def print_by_context(rows: List[FactRow], contexts: Dict[str, ContextInfo], max_
     Useful for sanity-checking parsed data.
     """
     grouped = _group_rows_by_context(rows)
+    # Lines are collected and written once, not one print() per line
+    out: List[str] = []
+    emit = out.append
 
-    for ctx_id, facts in sorted(grouped.items()):
+    for ctx_id, facts in grouped.items():
         ctx = contexts.get(ctx_id)
 
         if ctx is None:
@@ -285,24 +582,25 @@ def print_by_context(rows: List[FactRow], contexts: Dict[str, ContextInfo], max_
             inst = ctx.instant
             dims_dict = ctx.dims
 
-        print(f"\n=== CONTEXT {ctx_id} ===")
-        print(f"  start={start}  end={end}  instant={inst}")
+        emit(f"\n=== CONTEXT {ctx_id} ===")
+        emit(f"  start={start}  end={end}  instant={inst}")
 
         if dims_dict:
             dim_str = "; ".join(f"{dim}={member}" for dim, member in dims_dict.items())
         else:
             dim_str = "(no dimensions)"
-        print(f"  dims: {dim_str}")
-        print("  facts:")
+        emit(f"  dims: {dim_str}")
+        emit("  facts:")
 
         for r in facts[:max_facts_per_ctx]:
             v = r.value
             if len(v) > 50:
                 v = v[:47] + "..."
-            print(f"    {r.concept:80} {v:>15}")
+            emit(f"    {r.concept:80} {v:>15}")
 
         if len(facts) > max_facts_per_ctx:
-            print(f"    ... ({len(facts) - max_facts_per_ctx} more)")
-
+            emit(f"    ... ({len(facts) - max_facts_per_ctx} more)")
 
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
     return
\ No newline at end of file